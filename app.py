@@ -1,18 +1,33 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
 from flask_cors import CORS
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import schedule
+import socket
 import time
 import threading
-import requests
-from bs4 import BeautifulSoup
-from sentence_transformers import SentenceTransformer
-import pandas as pd
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dateutil import parser
-from azure.servicebus import ServiceBusClient, ServiceBusMessage
 import json
+import zlib
+import numpy as np
+from fetcher import FetchEngine
+from scheduler import StalenessScheduler, mentions_next_edition
+import sources
+import resources
+import metrics
+from dedup import dedupe_results, match_digest
+from notifications import NotificationDispatcher
+from keywords import KeywordMatcher
+import prefilter
+from job_events import JobEventLog
+from search_index import SearchIndex
+from embedding_cache import normalize_text
 
 app = Flask(__name__)
 CORS(app)
@@ -22,75 +37,348 @@ app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///con
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db = SQLAlchemy(app)
 
-# Initialize sentence transformer model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+def _commit():
+    """Commit the current session, recording how long the commit took."""
+    with metrics.DB_COMMIT_SECONDS.time():
+        db.session.commit()
+
+# The sentence transformer and Azure clients are loaded lazily through
+# resources, so CRUD-only workers never import torch. With PRELOAD_MODEL the
+# weights are loaded at import time, which under gunicorn's preload_app
+# happens once in the master and is shared copy-on-write with the workers.
+if os.getenv('PRELOAD_MODEL', 'false').lower() == 'true':
+    resources.preload()
+
+# Shared concurrent fetch engine for search requests
+fetcher = FetchEngine()
+
+# Cheap lexical filter applied to search results before transformer scoring
+result_prefilter = prefilter.LexicalPrefilter()
+
+# Keyword model, one row per distinct normalized keyword
+class Keyword(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True, index=True)
+
+# A conference's keyword, with the label it was given in, e.g. "Machine
+# Learning" for the shared keyword "machine learning"
+class ConferenceKeyword(db.Model):
+    __tablename__ = 'conference_keywords'
+    __table_args__ = (db.Index('ix_conference_keywords_keyword_id', 'keyword_id'),)
+    
+    conference_id = db.Column(db.Integer, db.ForeignKey('conference.id', ondelete='CASCADE'), primary_key=True)
+    keyword_id = db.Column(db.Integer, db.ForeignKey('keyword.id', ondelete='CASCADE'), primary_key=True)
+    label = db.Column(db.String(100))
+    keyword = db.relationship('Keyword', lazy='joined')
+
+conference_keywords = ConferenceKeyword.__table__
+
+MAX_KEYWORD_LENGTH = 100
+
+def _keyword_label(keyword):
+    """Collapse whitespace in a keyword, keeping the caller's casing."""
+    return ' '.join(keyword.split())
 
-# Initialize Azure Service Bus client
-servicebus_client = ServiceBusClient.from_connection_string(
-    os.getenv('AZURE_SERVICEBUS_CONNECTION_STRING')
-)
-notification_queue = servicebus_client.get_queue_client(
-    os.getenv('AZURE_SERVICEBUS_QUEUE_NAME')
-)
+def _normalize_keyword(keyword):
+    return _keyword_label(keyword).lower()
+
+def _insert_keywords(names):
+    """Insert Keyword rows in a savepoint, so a conflict only undoes these inserts."""
+    rows = {name: Keyword(name=name) for name in names}
+    with db.session.begin_nested():
+        db.session.add_all(rows.values())
+    return rows
+
+def _keyword_rows(names):
+    """Return Keyword rows for normalized names, inserting the missing ones.
+
+    A concurrent request may insert the same keyword between the lookup and
+    the insert. The unique constraint then rejects ours, and the keywords are
+    inserted one at a time, re-reading any that already exist.
+    """
+    names = list(dict.fromkeys(names))
+    rows = {keyword.name: keyword for keyword in Keyword.query.filter(Keyword.name.in_(names))} if names else {}
+    missing = [name for name in names if name not in rows]
+    if not missing:
+        return rows
+    try:
+        rows.update(_insert_keywords(missing))
+    except IntegrityError:
+        for name in missing:
+            try:
+                rows.update(_insert_keywords([name]))
+            except IntegrityError:
+                rows[name] = Keyword.query.filter_by(name=name).one()
+    return rows
 
 # Conference model
 class Conference(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(200), nullable=False)
-    year = db.Column(db.Integer, nullable=False)
-    keywords = db.Column(db.String(500), nullable=False)
+    name = db.Column(db.String(200), nullable=False, index=True)
+    year = db.Column(db.Integer, nullable=False, index=True)
+    # Legacy comma-joined keyword labels, kept in sync with keyword_links for older readers
+    keywords_csv = db.Column('keywords', db.String(500), nullable=False)
     link = db.Column(db.String(500))
-    last_checked = db.Column(db.DateTime, default=datetime.utcnow)
-    status = db.Column(db.String(50), default='Idle')
+    # NULL until the first check, so new conferences are due immediately
+    last_checked = db.Column(db.DateTime, index=True)
+    status = db.Column(db.String(50), default='Idle', index=True)
+    # Set once a match mentions the next edition and kept by later checks, so
+    # the scheduler keeps backing the conference off
+    next_edition_found = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    keyword_links = db.relationship('ConferenceKeyword', lazy='selectin', cascade='all, delete-orphan')
+    # Read-only view of the shared keywords, for filtering by keyword
+    keyword_tags = db.relationship('Keyword', secondary=conference_keywords, viewonly=True)
 
-    def to_dict(self):
-        return {
+    @property
+    def keywords(self):
+        links = sorted(self.keyword_links, key=lambda link: link.keyword.name)
+        return [link.label or link.keyword.name for link in links]
+
+    def set_keywords(self, keywords, keyword_rows=None):
+        """Replace the conference's keywords, creating Keyword rows as needed.
+
+        Keywords are matched case-insensitively but keep the label they were
+        given in. ``keyword_rows`` maps normalized names to Keyword rows
+        already loaded by the caller, e.g. once for a whole bulk import batch.
+        """
+        labels = {}
+        for keyword in keywords:
+            label = _keyword_label(keyword)
+            if label:
+                labels.setdefault(label.lower(), label)
+        if keyword_rows is None:
+            keyword_rows = _keyword_rows(list(labels))
+        current = {link.keyword.name: link for link in self.keyword_links}
+        links = []
+        for name, label in labels.items():
+            link = current.get(name) or ConferenceKeyword(keyword=keyword_rows[name])
+            link.label = label
+            links.append(link)
+        self.keyword_links = links
+        self.keywords_csv = ','.join(labels.values())[:500]
+
+    def to_dict(self, fields=None):
+        data = {
             'id': self.id,
             'name': self.name,
             'year': self.year,
-            'keywords': self.keywords.split(','),
+            'keywords': self.keywords,
             'link': self.link,
-            'last_checked': self.last_checked.isoformat(),
+            'last_checked': self.last_checked.isoformat() if self.last_checked else None,
             'status': self.status
         }
+        if fields:
+            return {field: data[field] for field in fields}
+        return data
+
+MAX_PAGE_SIZE = 1000
+CONFERENCE_FIELDS = ('id', 'name', 'year', 'keywords', 'link', 'last_checked', 'status')
+
+# Version counter per table, bumped on every write so list responses can be
+# served with an ETag that changes exactly when the data does
+class TableVersion(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# Time-limited claims on periodic work, so that of the workers ticking at the
+# same time only one runs it
+class SchedulerLease(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(100), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+# Matches that were already notified, keyed by conference and normalized URL
+class SeenMatch(db.Model):
+    __table_args__ = (db.UniqueConstraint('conference_id', 'digest'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    conference_id = db.Column(db.Integer, nullable=False, index=True)
+    digest = db.Column(db.String(16), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Background check job model
+class CheckJob(db.Model):
+    id = db.Column(db.String(36), primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    # Touched whenever the job makes progress; a queued or running job whose
+    # heartbeat stops was orphaned by a worker that died
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'total': self.total,
+            'completed': self.completed,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+# Matches found by a check job, appended as each chunk is written so progress
+# updates never rewrite the matches found before
+class CheckJobMatch(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), db.ForeignKey('check_job.id', ondelete='CASCADE'), nullable=False, index=True)
+    conference_id = db.Column(db.Integer, nullable=False)
+    conference_name = db.Column(db.String(200), nullable=False)
+    title = db.Column(db.Text, nullable=False)
+    source = db.Column(db.String(100))
+    link = db.Column(db.Text)
+    similarity = db.Column(db.Float, nullable=False)
+
+    def to_dict(self):
+        return {
+            'conference_id': self.conference_id,
+            'conference_name': self.conference_name,
+            'title': self.title,
+            'source': self.source,
+            'link': self.link,
+            'similarity': self.similarity
+        }
+
+def migrate_columns():
+    """Add columns introduced after a database was created. Safe to run repeatedly."""
+    inspector = inspect(db.engine)
+    for model in (Conference, ConferenceKeyword, CheckJob):
+        table = model.__table__
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=db.engine.dialect)}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg.compile(dialect=db.engine.dialect)}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            db.session.execute(db.text(ddl))
+            print(f"Added column {table.name}.{column.name}")
+    _commit()
+
+def migrate_keywords(batch_size=1000):
+    """Migrate databases created before keywords were normalized.
+
+    Adds the lookup indexes to an existing conference table and backfills
+    keyword associations from the legacy comma-joined column, in batches.
+    Safe to run repeatedly.
+    """
+    for index in Conference.__table__.indexes:
+        index.create(bind=db.engine, checkfirst=True)
+    
+    migrated = 0
+    last_id = 0
+    while True:
+        batch = (Conference.query
+                 .filter(Conference.id > last_id, ~Conference.keyword_tags.any())
+                 .order_by(Conference.id)
+                 .limit(batch_size)
+                 .all())
+        if not batch:
+            break
+        for conf in batch:
+            conf.set_keywords(keyword[:MAX_KEYWORD_LENGTH] for keyword in conf.keywords_csv.split(','))
+        _commit()
+        migrated += len(batch)
+        last_id = batch[-1].id
+    return migrated
+
+def _search_text(name, keywords_csv):
+    """Text a conference is indexed under for semantic search: its name and keywords."""
+    return normalize_text(f"{name}: {keywords_csv.replace(',', ', ')}")
+
+def _index_conferences(rows, batch_size=1000):
+    """Embed and index ``(id, name, keywords_csv)`` rows whose indexed text changed.
+
+    Returns how many conferences were embedded.
+    """
+    embedded = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        texts = [_search_text(name, keywords_csv) for _, name, keywords_csv in batch]
+        ids = np.array([row[0] for row in batch], dtype=np.int64)
+        digests = np.array([zlib.crc32(text.encode('utf-8')) for text in texts], dtype=np.uint32)
+        stale = search_index.stale(ids, digests)
+        if stale.any():
+            vectors = resources.get_scorer().encode([text for text, changed in zip(texts, stale) if changed])
+            search_index.upsert(ids[stale], digests[stale], vectors)
+            embedded += int(stale.sum())
+    return embedded
+
+def sync_search_index():
+    """Bring the search index in line with the conference table, embedding only changed rows."""
+    rows = [tuple(row) for row in
+            db.session.query(Conference.id, Conference.name, Conference.keywords_csv).order_by(Conference.id)]
+    db.session.remove()
+    removed = search_index.retain(row[0] for row in rows)
+    embedded = _index_conferences(rows)
+    return embedded, removed
+
+@app.cli.command('build-search-index')
+def build_search_index_command():
+    """Embed every conference into the semantic search index, then partition it if configured."""
+    embedded, removed = sync_search_index()
+    if search_index.ivf_lists:
+        search_index.train()
+    print(f"Search index: embedded {embedded}, removed {removed}, {len(search_index)} conferences indexed")
+
+@app.cli.command('migrate-keywords')
+def migrate_keywords_command():
+    """Backfill normalized keywords and indexes from the legacy keywords column."""
+    print(f"Migrated keywords for {migrate_keywords()} conferences")
 
 # Create tables
 with app.app_context():
     db.create_all()
+    if not TableVersion.query.get('conference'):
+        db.session.add(TableVersion(name='conference', version=0))
+        _commit()
+    try:
+        migrate_columns()
+    except Exception as e:
+        # Another worker may have added the columns at the same time
+        db.session.rollback()
+        print(f"Column migration skipped: {e}")
+    try:
+        migrate_keywords()
+    except Exception as e:
+        # Another worker may be migrating at the same time
+        db.session.rollback()
+        print(f"Keyword migration skipped: {e}")
 
-def _calculate_similarity(text1, text2):
-    """Calculate semantic similarity between two texts."""
-    embeddings = model.encode([text1, text2])
-    similarity = float(pd.DataFrame(embeddings).corr().iloc[0, 1])
-    return similarity
+def _bump_conference_version():
+    """Increment the conference table version as part of the current transaction."""
+    TableVersion.query.filter_by(name='conference').update({TableVersion.version: TableVersion.version + 1})
 
-def _search_conference(conference):
-    """Search for conference updates using Google."""
-    search_query = f"{conference['name']} {conference['year'] + 1} conference"
-    url = f"https://www.google.com/search?q={search_query}"
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
+def _conference_version():
+    return db.session.query(TableVersion.version).filter_by(name='conference').scalar() or 0
+
+def _search_url(conference):
+    """Build the Google search URL for a conference's next edition."""
+    return sources.google_search_url(f"{conference['name']} {conference['year'] + 1} conference")
+
+def _parse_search_page(html, keywords=None):
+    """Parse a Google result page into the top search results.
+
+    With a KeywordMatcher, results mentioning more of the conference's
+    keywords are moved ahead before the top results are taken.
+    """
+    if html is None:
+        return []
     try:
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        results = []
-        
-        for result in soup.find_all('div', class_='g'):
-            title_elem = result.find('h3')
-            link_elem = result.find('a')
-            if title_elem and link_elem:
-                results.append({
-                    'title': title_elem.text,
-                    'link': link_elem['href'],
-                    'source': 'Google Search'
-                })
-        
+        results = sources.parse_google_results(html)
+        if keywords:
+            results = keywords.rank(results)
         return results[:5]  # Return top 5 results
     except Exception as e:
-        print(f"Error searching for conference: {e}")
+        metrics.PARSE_ERRORS.inc()
+        print(f"Error parsing search results: {e}")
         return []
 
 def run_scheduler():
@@ -98,9 +386,138 @@ def run_scheduler():
         schedule.run_pending()
         time.sleep(60)
 
+# Worker pool that runs conference sweeps off the request threads
+job_executor = ThreadPoolExecutor(max_workers=int(os.getenv('CHECK_JOB_WORKERS', 2)), thread_name_prefix='check-job')
+
+# Events of this process's check jobs, followed by /api/conferences/check/stream
+check_events = JobEventLog()
+
+# Semantic search index, shared by the workers through memory-mapped files.
+# Updates run in order on one background thread, off the request path.
+search_index = SearchIndex()
+index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='search-index')
+search_index_synced = False
+
+def _run_index_task(func, *args):
+    try:
+        with app.app_context():
+            func(*args)
+    except Exception as e:
+        print(f"Error updating search index: {e}")
+
+def _index_rows(conferences):
+    """Snapshot the indexed fields of flushed conferences for a background update."""
+    return [(conf.id, conf.name, conf.keywords_csv) for conf in conferences]
+
+def _queue_index_update(rows):
+    index_executor.submit(_run_index_task, _index_conferences, rows)
+
+def _queue_index_removal(conference_ids):
+    index_executor.submit(_run_index_task, search_index.remove, list(conference_ids))
+
+def _stale_job_cutoff():
+    """Heartbeats older than this belong to jobs whose worker is gone."""
+    return datetime.utcnow() - timedelta(minutes=float(os.getenv('CHECK_JOB_STALE_MINUTES', 30)))
+
+def _fail_stale_jobs():
+    """Fail queued or running jobs that stopped making progress, e.g. because their worker was restarted.
+
+    Returns how many jobs were failed.
+    """
+    failed = CheckJob.query.filter(
+        CheckJob.status.in_(['queued', 'running']),
+        db.or_(CheckJob.heartbeat_at < _stale_job_cutoff(), CheckJob.heartbeat_at.is_(None))
+    ).update({
+        CheckJob.status: 'failed',
+        CheckJob.error: 'Job stopped making progress',
+        CheckJob.finished_at: datetime.utcnow()
+    }, synchronize_session=False)
+    _commit()
+    if failed:
+        print(f"Failed {failed} stale check jobs")
+    return failed
+
+def _submit_check_job(job_id, conference_ids=None):
+    check_events.open(job_id)
+    job_executor.submit(_run_check_job, job_id, conference_ids)
+
+due_scheduler = StalenessScheduler(key=lambda conference: conference['id'])
+
+def _claim_lease(name, seconds):
+    """Claim the named lease for ``seconds`` if it is free and return whether this process got it.
+
+    The claim is one conditional UPDATE, or the INSERT of a lease that does
+    not exist yet, so when every worker tries at once exactly one succeeds.
+    """
+    now = datetime.utcnow()
+    holder = f"{socket.gethostname()}:{os.getpid()}"
+    expires_at = now + timedelta(seconds=seconds)
+    claimed = SchedulerLease.query.filter(
+        SchedulerLease.name == name, SchedulerLease.expires_at <= now
+    ).update({SchedulerLease.holder: holder, SchedulerLease.expires_at: expires_at}, synchronize_session=False)
+    if not claimed and db.session.query(SchedulerLease.name).filter_by(name=name).first() is None:
+        db.session.add(SchedulerLease(name=name, holder=holder, expires_at=expires_at))
+        claimed = 1
+    try:
+        _commit()
+    except IntegrityError:
+        # Another worker created the lease first
+        db.session.rollback()
+        return False
+    return bool(claimed)
+
+def _queue_due_check():
+    """Queue a check job for the slice of conferences that are currently due.
+
+    Every worker runs the scheduler, so each tick is claimed through a lease
+    lasting half a tick and only the worker holding it queues the job.
+    """
+    with app.app_context():
+        if not _claim_lease('due-check', float(os.getenv('SCHEDULER_TICK_MINUTES', 60)) * 30):
+            return
+        
+        # Let a running sweep finish before queueing the next slice, unless
+        # its worker died and left it behind
+        _fail_stale_jobs()
+        if CheckJob.query.filter(CheckJob.status.in_(['queued', 'running'])).first():
+            return
+        
+        rows = db.session.query(Conference.id, Conference.year, Conference.last_checked,
+                                Conference.next_edition_found).all()
+        due_scheduler.load({
+            'id': row.id,
+            'year': row.year,
+            'last_checked': row.last_checked,
+            'next_edition_found': row.next_edition_found
+        } for row in rows)
+        due = due_scheduler.pop_due(now=datetime.utcnow())
+        if not due:
+            return
+        
+        job = CheckJob(id=str(uuid.uuid4()))
+        db.session.add(job)
+        _commit()
+        _submit_check_job(job.id, [conference['id'] for conference in due])
+        print(f"Queued scheduled check of {len(due)} due conferences")
+
+def start_scheduler():
+    """Start the scheduler thread once per process.
+
+    Threads do not survive fork, so with gunicorn's preload_app this is
+    called from the post_fork hook in gunicorn.conf.py instead of at import.
+    """
+    global scheduler_thread
+    if scheduler_thread is not None or os.getenv('SCHEDULER_ENABLED', 'true').lower() != 'true':
+        return
+    schedule.every(float(os.getenv('SCHEDULER_TICK_MINUTES', 60))).minutes.do(_queue_due_check)
+    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
+    scheduler_thread.start()
+
+scheduler_thread = None
+
 # Start the scheduler in a background thread
-scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-scheduler_thread.start()
+if os.getenv('PRELOAD_MODEL', 'false').lower() != 'true':
+    start_scheduler()
 
 @app.route('/')
 def index():
@@ -108,110 +525,670 @@ def index():
 
 @app.route('/api/conferences', methods=['GET'])
 def get_conferences():
-    conferences = Conference.query.all()
-    return jsonify([conf.to_dict() for conf in conferences])
+    """List conferences.
+
+    Query parameters (all optional):
+    - ``name``: case-insensitive substring of the conference name
+    - ``year``: exact year
+    - ``keyword``: conference keyword (case-insensitive)
+    - ``checked_before``: ISO timestamp; only conferences last checked earlier
+      or never checked
+    - ``fields``: comma-separated subset of fields to return
+    - ``limit`` and ``cursor``: page size and the ``X-Next-Cursor`` value of
+      the previous page; without ``limit`` every matching row is returned
+
+    Responses carry an ETag derived from the conference table version, so
+    unchanged lists are answered with 304 Not Modified.
+    """
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    unknown = [field for field in fields if field not in CONFERENCE_FIELDS]
+    if unknown:
+        return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+    try:
+        year = int(request.args['year']) if 'year' in request.args else None
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+        cursor = int(request.args['cursor']) if 'cursor' in request.args else None
+        checked_before = parser.isoparse(request.args['checked_before']) if 'checked_before' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'Invalid year, limit, cursor or checked_before'}), 400
+    
+    version = _conference_version()
+    etag = f"{version}-{zlib.crc32(request.query_string):08x}"
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    
+    query = Conference.query
+    if request.args.get('name'):
+        query = query.filter(Conference.name.ilike(f"%{request.args['name']}%"))
+    if year is not None:
+        query = query.filter(Conference.year == year)
+    if request.args.get('keyword'):
+        query = query.join(Conference.keyword_tags).filter(Keyword.name == _normalize_keyword(request.args['keyword']))
+    if checked_before is not None:
+        query = query.filter(db.or_(Conference.last_checked < checked_before, Conference.last_checked.is_(None)))
+    if cursor is not None:
+        query = query.filter(Conference.id > cursor)
+    query = query.order_by(Conference.id)
+    
+    next_cursor = None
+    if limit:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        conferences = query.limit(limit + 1).all()
+        if len(conferences) > limit:
+            conferences = conferences[:limit]
+            next_cursor = str(conferences[-1].id)
+    else:
+        conferences = query.all()
+    
+    response = jsonify([conf.to_dict(fields) for conf in conferences])
+    response.set_etag(etag)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
 
 @app.route('/api/conferences', methods=['POST'])
 def add_conference():
     data = request.json
-    keywords_str = ','.join(data['keywords'])
-    
+    error = _validate_conference_row(data)
+    if error:
+        return jsonify({'error': error}), 400
     conference = Conference(
         name=data['name'],
         year=data['year'],
-        keywords=keywords_str,
         link=data.get('link')
     )
+    conference.set_keywords(data['keywords'])
     
     db.session.add(conference)
-    db.session.commit()
+    _bump_conference_version()
+    db.session.flush()
+    rows = _index_rows([conference])
+    _commit()
+    _queue_index_update(rows)
     
     return jsonify(conference.to_dict()), 201
 
+def _validate_conference_row(data):
+    """Return an error message for an invalid conference payload, or None."""
+    if not isinstance(data, dict):
+        return "Expected a JSON object"
+    if not isinstance(data.get('name'), str) or not data['name'].strip():
+        return "'name' must be a non-empty string"
+    if len(data['name']) > 200:
+        return "'name' must be at most 200 characters"
+    if not isinstance(data.get('year'), int) or isinstance(data['year'], bool):
+        return "'year' must be an integer"
+    keywords = data.get('keywords')
+    if not isinstance(keywords, list) or not keywords or not all(isinstance(keyword, str) for keyword in keywords):
+        return "'keywords' must be a non-empty list of strings"
+    if any(len(_keyword_label(keyword)) > MAX_KEYWORD_LENGTH for keyword in keywords):
+        return f"'keywords' must each be at most {MAX_KEYWORD_LENGTH} characters"
+    if data.get('link') is not None and (not isinstance(data['link'], str) or len(data['link']) > 500):
+        return "'link' must be a string of at most 500 characters"
+    return None
+
+def _iter_bulk_rows():
+    """Yield the rows of a bulk request body, either NDJSON or a JSON array."""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON: {e}")
+    else:
+        rows = request.get_json(silent=True)
+        if not isinstance(rows, list):
+            raise ValueError("Expected a JSON array or an NDJSON body")
+        yield from rows
+
+def _insert_conference_batch(rows):
+    """Insert validated conference rows in one transaction."""
+    keyword_rows = _keyword_rows(
+        name for data in rows
+        for name in (_normalize_keyword(keyword) for keyword in data['keywords']) if name
+    )
+    conferences = []
+    for data in rows:
+        conference = Conference(name=data['name'].strip(), year=data['year'], link=data.get('link'))
+        conference.set_keywords(data['keywords'], keyword_rows)
+        db.session.add(conference)
+        conferences.append(conference)
+    _bump_conference_version()
+    db.session.flush()
+    index_rows = _index_rows(conferences)
+    _commit()
+    _queue_index_update(index_rows)
+
+@app.route('/api/conferences/bulk', methods=['POST'])
+def bulk_add_conferences():
+    """Add many conferences from a JSON array or an NDJSON stream.
+
+    Rows are validated individually and inserted in batched transactions;
+    invalid rows are skipped and reported by their zero-based position.
+    """
+    batch_size = int(os.getenv('BULK_BATCH_SIZE', 500))
+    created = 0
+    errors = []
+    batch = []
+    try:
+        for position, data in enumerate(_iter_bulk_rows()):
+            error = str(data) if isinstance(data, ValueError) else _validate_conference_row(data)
+            if error:
+                errors.append({'row': position, 'error': error})
+                continue
+            batch.append(data)
+            if len(batch) >= batch_size:
+                _insert_conference_batch(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            _insert_conference_batch(batch)
+            created += len(batch)
+    except ValueError as e:
+        return jsonify({'created': created, 'errors': [{'row': None, 'error': str(e)}]}), 400
+    
+    status = 201 if created else (400 if errors else 200)
+    return jsonify({'created': created, 'errors': errors}), status
+
+@app.route('/api/conferences/export', methods=['GET'])
+def export_conferences():
+    """Stream every conference as NDJSON, one page of rows in memory at a time."""
+    page_size = int(os.getenv('EXPORT_PAGE_SIZE', 1000))
+    
+    def generate():
+        last_id = 0
+        while True:
+            page = (Conference.query
+                    .filter(Conference.id > last_id)
+                    .order_by(Conference.id)
+                    .limit(page_size)
+                    .all())
+            if not page:
+                break
+            yield ''.join(json.dumps(conf.to_dict()) + '\n' for conf in page)
+            last_id = page[-1].id
+            # Release the page's objects before loading the next one
+            db.session.expunge_all()
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/conferences/search', methods=['GET'])
+def search_conferences():
+    """Find the tracked conferences semantically closest to ``q``.
+
+    Query parameters: ``q`` (required), ``limit`` (default 10) and ``fields``
+    as for the list endpoint. Each conference carries its cosine ``score``,
+    best first. The first search in a worker also queues a sync of the index
+    with the database, so rows written while the server was down are picked
+    up in the background.
+    """
+    global search_index_synced
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': "Missing query parameter 'q'"}), 400
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    unknown = [field for field in fields if field not in CONFERENCE_FIELDS]
+    if unknown:
+        return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), MAX_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    
+    if not search_index_synced:
+        search_index_synced = True
+        index_executor.submit(_run_index_task, sync_search_index)
+    
+    # Queries are one-off texts, so they are embedded without the persistent cache
+    hits = search_index.search(resources.get_scorer().encode([normalize_text(query)], use_cache=False)[0], limit)
+    conferences = {conf.id: conf for conf in Conference.query.filter(Conference.id.in_([hit[0] for hit in hits]))}
+    return jsonify([
+        dict(conferences[conference_id].to_dict(fields), score=score)
+        for conference_id, score in hits if conference_id in conferences
+    ])
+
+@app.route('/api/conferences/<int:conference_id>', methods=['GET'])
+def get_conference(conference_id):
+    conference = Conference.query.get_or_404(conference_id)
+    return jsonify(conference.to_dict())
+
 @app.route('/api/conferences/<int:conference_id>', methods=['PUT'])
 def update_conference(conference_id):
     conference = Conference.query.get_or_404(conference_id)
     data = request.json
+    error = _validate_conference_row(data)
+    if error:
+        return jsonify({'error': error}), 400
     
     conference.name = data['name']
+    if data['year'] != conference.year:
+        # A match for the old year's next edition says nothing about the new one
+        conference.next_edition_found = False
     conference.year = data['year']
-    conference.keywords = ','.join(data['keywords'])
+    conference.set_keywords(data['keywords'])
     conference.link = data.get('link')
     
-    db.session.commit()
+    _bump_conference_version()
+    rows = _index_rows([conference])
+    _commit()
+    _queue_index_update(rows)
     return jsonify(conference.to_dict())
 
 @app.route('/api/conferences/<int:conference_id>', methods=['DELETE'])
 def delete_conference(conference_id):
     conference = Conference.query.get_or_404(conference_id)
+    SeenMatch.query.filter_by(conference_id=conference_id).delete()
     db.session.delete(conference)
-    db.session.commit()
+    _bump_conference_version()
+    _commit()
+    _queue_index_removal([conference_id])
     return '', 204
 
-def _send_notification(conference, result):
-    """Send notification about a potential conference match using Azure Service Bus."""
+@app.route('/api/conferences', methods=['DELETE'])
+def delete_conferences():
+    """Delete the conferences given by ``?ids=1,2,3`` in a single transaction.
+
+    For selections too long for a URL the ids can be sent as a JSON body,
+    ``{"ids": [1, 2, 3]}``. Unknown ids are ignored; the response reports how
+    many conferences were deleted.
+    """
     try:
-        message = {
-            "type": "conference_match",
-            "conference_name": conference.name,
-            "conference_year": conference.year,
-            "match_title": result['title'],
-            "source": result['source'],
-            "link": result['link'],
-            "similarity_score": _calculate_similarity(conference.name, result['title']),
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        servicebus_message = ServiceBusMessage(
-            json.dumps(message),
-            content_type="application/json"
-        )
-        
-        notification_queue.send_messages(servicebus_message)
-        print(f"Notification sent for {conference.name}")
-    except Exception as e:
-        print(f"Error sending notification: {e}")
+        if 'ids' in request.args:
+            ids = [int(conference_id) for conference_id in request.args['ids'].split(',') if conference_id.strip()]
+        else:
+            ids = [int(conference_id) for conference_id in (request.get_json(silent=True) or {}).get('ids', [])]
+    except (TypeError, ValueError):
+        return jsonify({'error': "'ids' must be a list of conference ids"}), 400
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return jsonify({'error': "No conference ids given"}), 400
+    
+    batch_size = int(os.getenv('BULK_BATCH_SIZE', 500))
+    deleted = 0
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        SeenMatch.query.filter(SeenMatch.conference_id.in_(batch)).delete(synchronize_session=False)
+        db.session.execute(conference_keywords.delete().where(conference_keywords.c.conference_id.in_(batch)))
+        deleted += Conference.query.filter(Conference.id.in_(batch)).delete(synchronize_session=False)
+    if deleted:
+        _bump_conference_version()
+    _commit()
+    if deleted:
+        _queue_index_removal(ids)
+    return jsonify({'deleted': deleted})
 
-@app.route('/api/conferences/check', methods=['POST'])
-def check_conferences():
-    conferences = Conference.query.all()
-    results = []
+def _snapshot_conferences(conference_ids=None):
+    """Load the conferences to check as plain dicts, detached from the session."""
+    query = Conference.query
+    if conference_ids is not None:
+        query = query.filter(Conference.id.in_(conference_ids))
+    return [{
+        'id': conf.id,
+        'name': conf.name,
+        'year': conf.year,
+        'keywords': conf.keywords,
+        'link': conf.link,
+        'next_edition_found': conf.next_edition_found
+    } for conf in query.order_by(Conference.id)]
+
+def _begin_chunk(chunk):
+    """Mark a chunk as being checked and return its already-notified match digests.
+
+    Runs inside the caller's transaction so it can share a commit with the
+    previous chunk's results.
+    """
+    ids = [conf['id'] for conf in chunk]
+    Conference.query.filter(Conference.id.in_(ids)).update(
+        {Conference.status: 'Checking...'}, synchronize_session=False
+    )
+    _bump_conference_version()
+    return {
+        (row.conference_id, row.digest)
+        for row in db.session.query(SeenMatch.conference_id, SeenMatch.digest)
+        .filter(SeenMatch.conference_id.in_(ids))
+    }
+
+def _check_batch(conferences, threshold, notifier, seen, prefilter_stats=None):
+    """Search and score a batch of conferences without touching the database.
+
+    Returns the matches, the status updates for the conferences and the
+    SeenMatch rows to insert once the matches' digest has been delivered.
+    Prefilter outcomes are counted into ``prefilter_stats``.
+    """
+    # Search for updates on all conferences concurrently
+    urls = [_search_url(conf) for conf in conferences]
+    pages = fetcher.fetch_all(urls)
     
-    for conf in conferences:
-        conf.status = 'Checking...'
-        db.session.commit()
-        
-        # Convert database model to search format
-        search_conf = {
-            'name': conf.name,
-            'year': conf.year,
-            'keywords': conf.keywords.split(','),
-            'link': conf.link
-        }
-        
-        # Search for updates
-        search_results = _search_conference(search_conf)
-        
-        # Update status
-        conf.status = 'Checked'
-        conf.last_checked = datetime.utcnow()
-        db.session.commit()
-        
-        # Add results and send notifications
-        for result in search_results:
-            similarity = _calculate_similarity(conf.name, result['title'])
-            if similarity > float(os.getenv('SIMILARITY_THRESHOLD', 0.7)):
+    # Drop duplicate results, results that were already notified in earlier
+    # runs and results the lexical prefilter rules out
+    batches = [
+        (conf, result_prefilter.filter(conf, [
+            result for result in dedupe_results(_parse_search_page(pages[url], KeywordMatcher(conf['keywords'])))
+            if (conf['id'], match_digest(conf['id'], result['link']).hex()) not in seen
+        ], prefilter_stats))
+        for conf, url in zip(conferences, urls)
+    ]
+    
+    # Score every result of the batch in one pass
+    all_scores = resources.get_scorer().score_results(
+        [(conf['name'], search_results) for conf, search_results in batches]
+    )
+    
+    # Collect results, notifications and status updates
+    results = []
+    updates = []
+    seen_rows = []
+    checked_at = datetime.utcnow()
+    for (conf, search_results), scores in zip(batches, all_scores):
+        next_edition_found = conf['next_edition_found']
+        for result, similarity in zip(search_results, scores):
+            if similarity > threshold:
                 results.append({
-                    'conference_id': conf.id,
-                    'conference_name': conf.name,
+                    'conference_id': conf['id'],
+                    'conference_name': conf['name'],
                     'title': result['title'],
                     'source': result['source'],
                     'link': result['link'],
                     'similarity': similarity
                 })
-                _send_notification(conf, result)
+                notifier.add(conf['name'], conf['year'], result, similarity)
+                seen_rows.append({
+                    'conference_id': conf['id'],
+                    'digest': match_digest(conf['id'], result['link']).hex(),
+                    'created_at': checked_at
+                })
+                next_edition_found = next_edition_found or mentions_next_edition(conf['year'], result)
+        
+        updates.append({
+            'id': conf['id'],
+            'status': 'Match found' if next_edition_found else 'Checked',
+            'last_checked': checked_at,
+            'next_edition_found': next_edition_found
+        })
     
-    return jsonify(results)
+    metrics.MATCHES.inc(len(results))
+    metrics.CONFERENCES_CHECKED.inc(len(conferences))
+    return results, updates, list({row['digest']: row for row in seen_rows}.values())
+
+def _insert_seen_matches(rows):
+    """Record notified matches, skipping any another sweep recorded concurrently.
+
+    The digest was already sent, so a duplicate must not fail the job.
+    """
+    try:
+        db.session.bulk_insert_mappings(SeenMatch, rows)
+        _commit()
+    except IntegrityError:
+        db.session.rollback()
+        for row in rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(SeenMatch(**row))
+            except IntegrityError:
+                pass  # Recorded by the other sweep
+        _commit()
+
+def _job_event(job_id, status, total, completed, error=None):
+    return {'event': 'job', 'id': job_id, 'status': status, 'total': total, 'completed': completed, 'error': error}
+
+def _status_events(chunk, status, checked_at=None):
+    return [{
+        'event': 'status',
+        'conference_id': conf['id'],
+        'status': status,
+        'last_checked': checked_at.isoformat() if checked_at else None
+    } for conf in chunk]
+
+def _run_check_job(job_id, conference_ids=None):
+    """Run a conference sweep for a queued job, recording progress as it goes.
+
+    Checks every conference unless ``conference_ids`` limits the sweep.
+    Database work happens in one short transaction per chunk: it writes the
+    finished chunk's statuses and job progress, and marks the next chunk as
+    checking. The session is released before any network I/O, so no
+    connection or lock is held while scraping. Matches are recorded as seen
+    in a last transaction, only after their digest was delivered, so a failed
+    send is retried by the next sweep.
+    
+    Each committed change is also published to ``check_events``: status
+    transitions per conference, the chunk's matches and the job's progress.
+    """
+    with app.app_context():
+        try:
+            threshold = float(os.getenv('SIMILARITY_THRESHOLD', 0.7))
+            chunk_size = int(os.getenv('CHECK_CHUNK_SIZE', 25))
+            conferences = _snapshot_conferences(conference_ids)
+            chunks = [conferences[start:start + chunk_size] for start in range(0, len(conferences), chunk_size)]
+            
+            claimed = CheckJob.query.filter_by(id=job_id, status='queued').update({
+                CheckJob.status: 'running',
+                CheckJob.started_at: datetime.utcnow(),
+                CheckJob.heartbeat_at: datetime.utcnow(),
+                CheckJob.total: len(conferences)
+            })
+            if not claimed:
+                # Failed as stale while it waited for a worker
+                db.session.rollback()
+                print(f"Check job {job_id} is no longer queued, skipping it")
+                check_events.close(job_id)
+                db.session.remove()
+                return
+            seen = _begin_chunk(chunks[0]) if chunks else set()
+            _commit()
+            db.session.remove()
+            check_events.publish(job_id, _job_event(job_id, 'running', len(conferences), 0),
+                                 *(_status_events(chunks[0], 'Checking...') if chunks else []))
+            
+            pending_seen = []
+            completed = 0
+            prefilter_stats = Counter()
+            notifier = NotificationDispatcher()
+            for index, chunk in enumerate(chunks):
+                chunk_results, updates, seen_rows = _check_batch(chunk, threshold, notifier, seen, prefilter_stats)
+                pending_seen.extend(seen_rows)
+                completed += len(chunk)
+                
+                db.session.bulk_update_mappings(Conference, updates)
+                if chunk_results:
+                    db.session.bulk_insert_mappings(CheckJobMatch, [dict(result, job_id=job_id) for result in chunk_results])
+                CheckJob.query.filter_by(id=job_id).update({
+                    CheckJob.heartbeat_at: datetime.utcnow(),
+                    CheckJob.completed: completed
+                })
+                if index + 1 < len(chunks):
+                    seen = _begin_chunk(chunks[index + 1])
+                else:
+                    _bump_conference_version()
+                _commit()
+                db.session.remove()
+                
+                check_events.publish(
+                    job_id,
+                    *({'event': 'match', **result} for result in chunk_results),
+                    *({
+                        'event': 'status',
+                        'conference_id': update['id'],
+                        'status': update['status'],
+                        'last_checked': update['last_checked'].isoformat()
+                    } for update in updates),
+                    _job_event(job_id, 'running', len(conferences), completed),
+                    *(_status_events(chunks[index + 1], 'Checking...') if index + 1 < len(chunks) else [])
+                )
+            
+            print(f"Check job {job_id}: prefilter {prefilter.describe(prefilter_stats)}")
+            
+            # Send one digest for the whole sweep, then record its matches as seen
+            try:
+                notifier.flush().result()
+            finally:
+                notifier.close()
+            if pending_seen:
+                # Another sweep may have recorded some of them meanwhile
+                ids = sorted({row['conference_id'] for row in pending_seen})
+                recorded = {
+                    (row.conference_id, row.digest)
+                    for start in range(0, len(ids), chunk_size)
+                    for row in db.session.query(SeenMatch.conference_id, SeenMatch.digest)
+                    .filter(SeenMatch.conference_id.in_(ids[start:start + chunk_size]))
+                }
+                _insert_seen_matches([
+                    row for row in pending_seen if (row['conference_id'], row['digest']) not in recorded
+                ])
+                db.session.remove()
+            status, error = 'finished', None
+        except Exception as e:
+            print(f"Error running check job {job_id}: {e}")
+            db.session.rollback()
+            status, error = 'failed', str(e)[:500]
+        try:
+            CheckJob.query.filter_by(id=job_id).update({
+                CheckJob.status: status,
+                CheckJob.error: error,
+                CheckJob.finished_at: datetime.utcnow()
+            })
+            _commit()
+            job = CheckJob.query.get(job_id)
+            check_events.publish(job_id, _job_event(job_id, status, job.total, job.completed, error))
+        finally:
+            # Followers stop waiting even if the final status could not be written
+            check_events.close(job_id)
+            db.session.remove()
+
+@app.route('/api/conferences/check', methods=['POST'])
+def check_conferences():
+    job = CheckJob(id=str(uuid.uuid4()))
+    db.session.add(job)
+    _commit()
+    
+    _submit_check_job(job.id)
+    
+    response = jsonify(job.to_dict())
+    response.headers['Location'] = f"/api/jobs/{job.id}"
+    return response, 202
+
+def _poll_job_events(job_id, heartbeat):
+    """Follow a job run by another worker process through its database row.
+
+    Yields the job's progress, new matches and conference status changes as
+    the rows change, and ``None`` whenever nothing changed for ``heartbeat``
+    seconds.
+    """
+    interval = float(os.getenv('CHECK_STREAM_POLL_INTERVAL', 1))
+    last_match_id = 0
+    last_state = None
+    checked_since = None
+    sent_statuses = {}
+    idle = 0.0
+    while True:
+        job = CheckJob.query.get(job_id)
+        if job.status in ('queued', 'running') and (job.heartbeat_at is None or job.heartbeat_at < _stale_job_cutoff()):
+            # Its worker died, so fail it rather than wait forever
+            _fail_stale_jobs()
+            job = CheckJob.query.get(job_id)
+        event = _job_event(job.id, job.status, job.total, job.completed, job.error)
+        # Matches are committed with the progress that counts them, so reading
+        # them after the job row never misses one the row already reports
+        matches = (CheckJobMatch.query
+                   .filter(CheckJobMatch.job_id == job_id, CheckJobMatch.id > last_match_id)
+                   .order_by(CheckJobMatch.id)
+                   .all())
+        state = (event['status'], event['completed'])
+        statuses = []
+        if state != last_state and job.started_at:
+            # Statuses are committed with the progress, so only read them when
+            # it moved: conferences being checked, and those checked since
+            checked_since = checked_since or job.started_at
+            statuses = (db.session.query(Conference.id, Conference.status, Conference.last_checked)
+                        .filter(db.or_(Conference.status == 'Checking...', Conference.last_checked > checked_since))
+                        .all())
+        db.session.remove()
+        
+        events = [{'event': 'match', **match.to_dict()} for match in matches]
+        if matches:
+            last_match_id = matches[-1].id
+        for conf_id, status, last_checked in statuses:
+            if sent_statuses.get(conf_id) != (status, last_checked):
+                sent_statuses[conf_id] = (status, last_checked)
+                events.append({
+                    'event': 'status',
+                    'conference_id': conf_id,
+                    'status': status,
+                    'last_checked': last_checked.isoformat() if last_checked else None
+                })
+            if last_checked and last_checked > checked_since:
+                checked_since = last_checked
+        if state != last_state:
+            last_state = state
+            events.append(event)
+        if events:
+            yield from events
+            idle = 0.0
+        elif idle >= heartbeat:
+            yield None
+            idle = 0.0
+        if event['status'] not in ('queued', 'running'):
+            return
+        time.sleep(interval)
+        idle += interval
+
+@app.route('/api/conferences/check/stream', methods=['GET'])
+def stream_check():
+    """Stream a check job's progress as NDJSON, one event per line, until it finishes.
+
+    Follows the job given by ``?job=`` or else the most recent queued or
+    running one. Events are ``job`` (status and progress), ``status`` (a
+    conference's status transition) and ``match`` (a result scored above the
+    threshold); ``heartbeat`` lines keep idle connections open.
+    """
+    job_id = request.args.get('job')
+    if job_id:
+        job = CheckJob.query.get_or_404(job_id)
+    else:
+        job = (CheckJob.query
+               .filter(CheckJob.status.in_(['queued', 'running']))
+               .order_by(CheckJob.created_at.desc())
+               .first_or_404())
+    job_id = job.id
+    db.session.remove()
+    
+    heartbeat = float(os.getenv('CHECK_STREAM_HEARTBEAT', 15))
+    if job_id in check_events:
+        events = check_events.follow(job_id, heartbeat)
+    else:
+        # The job runs in another worker process
+        events = _poll_job_events(job_id, heartbeat)
+    
+    def generate():
+        for event in events:
+            yield json.dumps(event or {'event': 'heartbeat'}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose this worker's metrics in the Prometheus text format."""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = CheckJob.query.get_or_404(job_id)
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def get_job_results(job_id):
+    job = CheckJob.query.get_or_404(job_id)
+    matches = CheckJobMatch.query.filter_by(job_id=job.id).order_by(CheckJobMatch.id)
+    return jsonify({
+        'id': job.id,
+        'status': job.status,
+        'results': [match.to_dict() for match in matches]
+    })
 
 if __name__ == '__main__':
     with app.app_context():
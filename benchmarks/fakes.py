@@ -0,0 +1,174 @@
+"""Local stand-ins for the services a conference sweep talks to.
+
+Used by the benchmarks so a sweep can run end to end without network
+access, Azure credentials or the transformer weights.
+"""
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+import numpy as np
+
+TOPICS = [
+    'machine learning', 'computer vision', 'databases', 'distributed systems',
+    'natural language processing', 'robotics', 'security', 'networking',
+    'software engineering', 'human computer interaction', 'data mining', 'theory'
+]
+
+_NOISE_TITLES = [
+    'Best hiking trails near the venue', 'Hotel deals for business travel',
+    'How to write a good abstract', 'Visa information for visitors',
+    'Airport transfer timetable', 'Local restaurants and cafes'
+]
+
+
+def synthetic_conferences(count: int, seed: int = 0) -> List[Dict]:
+    """Return ``count`` reproducible conference entries."""
+    rng = random.Random(seed)
+    conferences = []
+    for index in range(count):
+        topics = rng.sample(TOPICS, 2)
+        acronym = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(4))
+        conferences.append({
+            'name': f"{acronym} International Conference on {topics[0].title()} {index}",
+            'year': rng.choice([2024, 2025]),
+            'keywords': topics,
+            'link': f"https://{acronym.lower()}{index}.example.org"
+        })
+    return conferences
+
+
+def _filler(kilobytes: int) -> str:
+    """Markup that real result pages carry around the results (scripts, styles, navigation)."""
+    block = '<div class="nav"><span>menu</span><a href="/settings">Settings</a></div>' \
+            '<script>var x = {"a": [1, 2, 3], "b": "padding"};</script>'
+    return block * max(0, kilobytes * 1024 // len(block))
+
+
+def google_page(query: str, results: int = 8, filler_kb: int = 0) -> str:
+    """Return a Google-like result page whose first results echo the query."""
+    rng = random.Random(zlib.crc32(query.encode('utf-8')))
+    items = []
+    for index in range(results):
+        if index < 2:
+            title = f"{query} - Call for Papers" if index == 0 else f"{query} | Important Dates"
+        else:
+            title = rng.choice(_NOISE_TITLES)
+        items.append(
+            f'<div class="g"><a href="https://example.org/{quote_plus(title)}/{index}?utm_source=x">'
+            f'<h3>{title}</h3></a><div class="VwiC3b">Snippet for {title}</div></div>'
+        )
+    return f"<html><body>{_filler(filler_kb)}<div id=\"search\">{''.join(items)}</div></body></html>"
+
+
+def wikicfp_page(query: str, rows: int = 20, filler_kb: int = 0) -> str:
+    """Return a WikiCFP-like search page: navigation links plus a table of events."""
+    rng = random.Random(zlib.crc32(query.encode('utf-8')))
+    navigation = ''.join(f'<a href="/cfp/call?conference={topic}">{topic}</a> ' for topic in TOPICS)
+    cells = []
+    for index in range(rows):
+        topic = rng.choice(TOPICS)
+        cells.append(
+            f'<tr bgcolor="#f6f6f6"><td rowspan="2"><a href="/cfp/servlet/event.showcfp?eventid={index}">'
+            f'{query} {2024 + index % 3}</a></td><td colspan="3">{query} Workshop on {topic.title()}</td></tr>'
+            f'<tr bgcolor="#f6f6f6"><td>Jun {index % 28 + 1}, 2026</td><td>Online</td><td>Mar 1, 2026</td></tr>'
+        )
+    return (f"<html><body><div class=\"menu\">{navigation}</div>{_filler(filler_kb)}"
+            f"<div class=\"contsec\"><table>{''.join(cells)}</table></div></body></html>")
+
+
+def call4papers_page(query: str, links: int = 10, filler_kb: int = 0) -> str:
+    """Return a call4papers-like search page with a list of calls."""
+    rng = random.Random(zlib.crc32(query.encode('utf-8')))
+    items = ''.join(
+        f'<li><a href="/calls/{index}">{query} {rng.choice(TOPICS)} call</a></li>'
+        for index in range(links)
+    )
+    return f"<html><body>{_filler(filler_kb)}<ul class=\"results\">{items}</ul></body></html>"
+
+
+PAGES = {
+    'google': google_page,
+    'wikicfp': wikicfp_page,
+    'call4papers': call4papers_page
+}
+
+
+class FakeSourceServer:
+    """HTTP server answering ``?q=`` searches with canned pages of one source.
+
+    Each source runs on its own port so the fetch engine sees separate hosts,
+    as it does against the real sites. ``latency`` adds a fixed delay per
+    request to stand in for the network.
+    """
+
+    def __init__(self, source: str, latency: float = 0.0, filler_kb: int = 0):
+        render = PAGES[source]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlsplit(self.path).query).get('q', [''])[0]
+                if latency:
+                    time.sleep(latency)
+                body = render(query, filler_kb=filler_kb).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/search"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def start_source_servers(latency: float = 0.0, filler_kb: int = 0) -> Dict[str, FakeSourceServer]:
+    """Start one fake server per source and return them keyed by source."""
+    return {source: FakeSourceServer(source, latency, filler_kb).start() for source in PAGES}
+
+
+def source_environment(servers: Dict[str, FakeSourceServer]) -> Dict[str, str]:
+    """Environment variables pointing the sources module at the fake servers."""
+    return {
+        'GOOGLE_SEARCH_URL': servers['google'].url,
+        'WIKICFP_SEARCH_URL': servers['wikicfp'].url,
+        'CALL4PAPERS_SEARCH_URL': servers['call4papers'].url
+    }
+
+
+class HashingModel:
+    """Deterministic stand-in for the sentence transformer.
+
+    Embeds texts as hashed character trigram counts, which keeps similar
+    titles close together at a tiny fraction of the transformer's cost.
+    """
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+
+    def encode(self, texts, batch_size: int = 32, convert_to_numpy: bool = True, **kwargs):
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            text = text.lower()
+            for index in range(len(text) - 2):
+                vectors[row, zlib.crc32(text[index:index + 3].encode('utf-8')) % self.dimensions] += 1
+        return vectors[0] if single else vectors
@@ -0,0 +1,97 @@
+"""Measure HTML extraction throughput per source.
+
+Parses canned Google, WikiCFP and call4papers pages with the extractors in
+sources.py and reports pages and megabytes per second. When BeautifulSoup is
+installed, the previous ``html.parser`` implementation is measured as a
+baseline on the same pages:
+
+    python benchmarks/parse_benchmark.py
+    python benchmarks/parse_benchmark.py --pages 500 --filler-kb 100
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(BENCHMARKS), BENCHMARKS]
+
+import sources  # noqa: E402
+from keywords import KeywordMatcher  # noqa: E402
+from fakes import PAGES, TOPICS  # noqa: E402
+
+WEBSITE_URL = 'https://www.call4papers.com/search?q=x'
+
+
+def _baseline_google(html: str) -> List[Dict]:
+    from bs4 import BeautifulSoup
+
+    results = []
+    for result in BeautifulSoup(html, 'html.parser').select('div.g'):
+        title_elem = result.select_one('h3')
+        link_elem = result.select_one('a')
+        if title_elem and link_elem:
+            results.append({'title': title_elem.get_text(), 'link': link_elem.get('href')})
+    return results
+
+
+def _baseline_links(html: str, keywords: List[str]) -> List[Dict]:
+    from bs4 import BeautifulSoup
+
+    return [
+        {'title': link.text, 'link': link['href']}
+        for link in BeautifulSoup(html, 'html.parser').find_all('a', href=True)
+        if any(keyword.lower() in link.text.lower() for keyword in keywords)
+    ]
+
+
+def _measure(parse: Callable[[str], List[Dict]], pages: List[str]) -> Dict:
+    start = time.perf_counter()
+    results = sum(len(parse(page)) for page in pages)
+    elapsed = time.perf_counter() - start
+    megabytes = sum(len(page) for page in pages) / 1e6
+    return {'pages_per_s': len(pages) / elapsed, 'mb_per_s': megabytes / elapsed, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=200, help='pages per source')
+    parser.add_argument('--filler-kb', type=int, default=40, help='extra markup per page')
+    parser.add_argument('--no-baseline', action='store_true', help='skip the BeautifulSoup baseline')
+    args = parser.parse_args()
+
+    keywords = TOPICS[:4]
+    wikicfp_url = sources.WIKICFP_SEARCH_URL + '?q=x'
+    os.environ.pop('WIKICFP_SEARCH_URL', None)
+    matcher = KeywordMatcher(keywords)
+    parsers = {
+        'google': lambda html: sources.parse_google_results(html),
+        'wikicfp': lambda html: sources.parse_website_links(html, wikicfp_url, matcher),
+        'call4papers': lambda html: sources.parse_website_links(html, WEBSITE_URL, matcher)
+    }
+    baselines = {
+        'google': _baseline_google,
+        'wikicfp': lambda html: _baseline_links(html, keywords),
+        'call4papers': lambda html: _baseline_links(html, keywords)
+    }
+    try:
+        import bs4  # noqa: F401
+    except ImportError:
+        args.no_baseline = True
+
+    print(f"{args.pages} pages per source, {args.filler_kb} KB filler")
+    print(f"  {'source':<12}{'parser':<10}{'pages/s':>10}{'MB/s':>8}{'results':>9}")
+    for source, render in PAGES.items():
+        pages = [render(f"Conference {index} {TOPICS[index % len(TOPICS)]}", filler_kb=args.filler_kb)
+                 for index in range(args.pages)]
+        rows = [('lxml', _measure(parsers[source], pages))]
+        if not args.no_baseline:
+            rows.append(('bs4', _measure(baselines[source], pages)))
+        for name, stats in rows:
+            print(f"  {source:<12}{name:<10}{stats['pages_per_s']:>10.0f}{stats['mb_per_s']:>8.1f}"
+                  f"{stats['results']:>9}")
+
+
+if __name__ == '__main__':
+    main()
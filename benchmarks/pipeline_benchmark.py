@@ -0,0 +1,259 @@
+"""Benchmark the search-score-notify pipeline against local stand-ins.
+
+Runs full sweeps of synthetic conference lists through
+``ConferenceTracker.check_conferences`` and the ``/api/conferences/check``
+route. Fake Google, WikiCFP and call4papers servers answer the searches,
+notifications go to an in-memory transport, and every sweep runs in a fresh
+interpreter with its own temporary working directory:
+
+    python benchmarks/pipeline_benchmark.py --sizes 10,100,1000
+    python benchmarks/pipeline_benchmark.py --target api --fake-model --latency-ms 20
+    python benchmarks/pipeline_benchmark.py --sizes 10000 --json > bench.json
+
+For each sweep it reports throughput, per-stage latency percentiles (fetch,
+parse, embed, score, notify and, for the API, db), the peak RSS reached by
+the end of each stage and how many candidates the lexical prefilter pruned.
+``--check-recall`` runs every sweep with and without the prefilter and
+reports the share of matches it preserved; tune it through the
+``PREFILTER_*`` environment variables.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+
+STAGES = ('fetch', 'parse', 'embed', 'score', 'notify', 'db')
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class StageRecorder:
+    """Records the duration of every call made in each pipeline stage."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.peak_rss = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        rss = _peak_rss_mb()
+        with self._lock:
+            self.samples[stage].append(seconds)
+            self.peak_rss[stage] = max(self.peak_rss.get(stage, 0.0), rss)
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+        return timed
+
+    def summary(self) -> Dict[str, Dict]:
+        stages = {}
+        for stage in STAGES:
+            samples = self.samples.get(stage)
+            if not samples:
+                continue
+            stages[stage] = {
+                'calls': len(samples),
+                'total_s': sum(samples),
+                'p50_ms': percentile(samples, 0.50) * 1000,
+                'p95_ms': percentile(samples, 0.95) * 1000,
+                'p99_ms': percentile(samples, 0.99) * 1000,
+                'peak_rss_mb': self.peak_rss[stage]
+            }
+        return stages
+
+
+def _instrument(recorder: StageRecorder, fetcher, fake_model: bool):
+    """Wrap the stage entry points of the shared modules with timers."""
+    import resources
+    import sources
+
+    if fake_model:
+        from fakes import HashingModel
+        resources._model = HashingModel()
+    scorer = resources.get_scorer()
+    scorer.model.encode = recorder.wrap('embed', scorer.model.encode)
+    scorer.score_results = recorder.wrap('score', scorer.score_results)
+    sources.parse_google_results = recorder.wrap('parse', sources.parse_google_results)
+    sources.parse_website_links = recorder.wrap('parse', sources.parse_website_links)
+    fetcher.fetch = recorder.wrap('fetch', fetcher.fetch)
+
+
+def _fake_transport(recorder: StageRecorder):
+    from notifications import InMemoryTransport
+
+    transport = InMemoryTransport()
+    transport.send_email = recorder.wrap('notify', transport.send_email)
+    transport.send_messages = recorder.wrap('notify', transport.send_messages)
+    return transport
+
+
+def run_tracker(size: int, fake_model: bool) -> Dict:
+    """Sweep ``size`` conferences through ConferenceTracker.check_conferences."""
+    from confseeker import ConferenceTracker
+    from fakes import synthetic_conferences
+    from notifications import NotificationDispatcher
+
+    recorder = StageRecorder()
+    tracker = ConferenceTracker()
+    _instrument(recorder, tracker.fetcher, fake_model)
+    tracker.notifier = NotificationDispatcher(transport=_fake_transport(recorder), recipients=['bench@example.org'])
+    tracker.add_conferences(synthetic_conferences(size))
+
+    start = time.perf_counter()
+    tracker.check_conferences()
+    tracker.notifier.close()
+    elapsed = time.perf_counter() - start
+    return {'elapsed_s': elapsed, 'matches': len(tracker.seen_matches), 'stages': recorder.summary()}
+
+
+def run_api(size: int, fake_model: bool) -> Dict:
+    """Sweep ``size`` conferences through POST /api/conferences/check."""
+    import functools
+    from sqlalchemy import event
+
+    import app
+    from fakes import synthetic_conferences
+    from notifications import NotificationDispatcher
+
+    recorder = StageRecorder()
+    _instrument(recorder, app.fetcher, fake_model)
+    app.NotificationDispatcher = functools.partial(
+        NotificationDispatcher, transport=_fake_transport(recorder), recipients=['bench@example.org']
+    )
+    with app.app.app_context():
+        engine = app.db.engine
+    started = threading.local()
+    event.listen(engine, 'before_cursor_execute',
+                 lambda *args: setattr(started, 'at', time.perf_counter()))
+    event.listen(engine, 'after_cursor_execute',
+                 lambda *args: recorder.record('db', time.perf_counter() - started.at))
+
+    client = app.app.test_client()
+    response = client.post('/api/conferences/bulk', json=synthetic_conferences(size))
+    assert response.status_code == 201, response.get_data(as_text=True)
+    recorder.samples.pop('db', None)
+
+    start = time.perf_counter()
+    job_id = client.post('/api/conferences/check').get_json()['id']
+    while True:
+        job = client.get(f'/api/jobs/{job_id}').get_json()
+        if job['status'] not in ('queued', 'running'):
+            break
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    assert job['status'] == 'finished', job
+    matches = len(client.get(f'/api/jobs/{job_id}/results').get_json()['results'])
+    return {'elapsed_s': elapsed, 'matches': matches, 'stages': recorder.summary()}
+
+
+def _child(target: str, size: int, fake_model: bool):
+    sys.path[:0] = [ROOT, BENCHMARKS]
+    result = (run_tracker if target == 'tracker' else run_api)(size, fake_model)
+
+    import metrics
+    outcomes = {outcome: metrics.PREFILTER.get(result=outcome)
+                for outcome in ('kept', 'url', 'title', 'year', 'lexical')}
+    result.update(target=target, size=size, peak_rss_mb=_peak_rss_mb(),
+                  conferences_per_s=size / result['elapsed_s'] if result['elapsed_s'] else 0.0,
+                  prefilter={outcome: count for outcome, count in outcomes.items() if count})
+    print(json.dumps(result))
+
+
+def _run_child(target: str, size: int, args, env: Dict[str, str], **overrides) -> Dict:
+    command = [sys.executable, os.path.abspath(__file__), '--child', target, '--sizes', str(size)]
+    if args.fake_model:
+        command.append('--fake-model')
+    with tempfile.TemporaryDirectory(prefix='confseeker-bench-') as workdir:
+        child_env = dict(env, DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'conferences.db')}", **overrides)
+        completed = subprocess.run(command, cwd=workdir, env=child_env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{target} sweep of {size} failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _print_result(result: Dict):
+    print(f"{result['target']}: {result['size']} conferences in {result['elapsed_s']:.2f}s "
+          f"({result['conferences_per_s']:.1f}/s), {result['matches']} matches, "
+          f"peak RSS {result['peak_rss_mb']:.0f} MB")
+    candidates = sum(result['prefilter'].values())
+    if candidates:
+        pruned = ', '.join(f"{reason} {count:.0f}" for reason, count in result['prefilter'].items() if reason != 'kept')
+        print(f"  prefilter kept {result['prefilter'].get('kept', 0):.0f} of {candidates:.0f}"
+              + (f" ({pruned})" if pruned else ''))
+    print(f"  {'stage':<8}{'calls':>8}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'RSS MB':>9}")
+    for stage, stats in result['stages'].items():
+        print(f"  {stage:<8}{stats['calls']:>8}{stats['total_s']:>10.2f}{stats['p50_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['peak_rss_mb']:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=['tracker', 'api', 'both'], default='both')
+    parser.add_argument('--sizes', default='10,100,1000', help='comma-separated conference list sizes')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='delay added by the fake servers')
+    parser.add_argument('--filler-kb', type=int, default=40, help='extra markup per fake result page')
+    parser.add_argument('--fake-model', action='store_true', help='use a hashing embedder instead of the transformer')
+    parser.add_argument('--check-recall', action='store_true',
+                        help='also run every sweep without the prefilter and compare matches')
+    parser.add_argument('--json', action='store_true', help='print one JSON object per sweep')
+    parser.add_argument('--child', choices=['tracker', 'api'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    if args.child:
+        _child(args.child, sizes[0], args.fake_model)
+        return
+
+    sys.path.insert(0, BENCHMARKS)
+    from fakes import source_environment, start_source_servers
+
+    servers = start_source_servers(latency=args.latency_ms / 1000, filler_kb=args.filler_kb)
+    env = dict(os.environ, SCHEDULER_ENABLED='false', PRELOAD_MODEL='false', HTTP_CACHE_DIR='',
+               NOTIFICATION_EMAIL='bench@example.org', SWEEP_FETCH_DEADLINE='', **source_environment(servers))
+    targets = ['tracker', 'api'] if args.target == 'both' else [args.target]
+    try:
+        for size in sizes:
+            for target in targets:
+                result = _run_child(target, size, args, env)
+                if args.check_recall:
+                    unfiltered = _run_child(target, size, args, env, PREFILTER_ENABLED='false')
+                    result['recall'] = result['matches'] / unfiltered['matches'] if unfiltered['matches'] else 1.0
+                    result['unfiltered_elapsed_s'] = unfiltered['elapsed_s']
+                if args.json:
+                    print(json.dumps(result))
+                else:
+                    _print_result(result)
+                    if 'recall' in result:
+                        print(f"  recall {result['recall']:.3f} of {unfiltered['matches']} unfiltered matches, "
+                              f"{unfiltered['elapsed_s']:.2f}s without the prefilter")
+    finally:
+        for server in servers.values():
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Measure semantic search index latency and recall.
+
+Fills a temporary index with clustered random unit vectors, shaped like
+sentence embeddings, and times queries against it for each layout: exact
+float32, int8-quantized and IVF-partitioned. Recall is measured against an
+exact top-k over the same vectors:
+
+    python benchmarks/search_benchmark.py
+    python benchmarks/search_benchmark.py --rows 100000 --lists 316 --probes 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex  # noqa: E402
+from similarity import normalize  # noqa: E402
+
+
+def clustered_vectors(rows: int, dim: int, clusters: int, noise: float, rng) -> np.ndarray:
+    centers = normalize(rng.standard_normal((clusters, dim)))
+    return normalize(centers[rng.integers(0, clusters, rows)] + noise * rng.standard_normal((rows, dim)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=384, help='embedding size (384 for all-MiniLM-L6-v2)')
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--lists', type=int, default=316, help='IVF lists, about sqrt(rows)')
+    parser.add_argument('--probes', type=int, default=8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = clustered_vectors(args.rows, args.dim, max(1, args.rows // 50), 0.02, rng)
+    picks = rng.integers(0, args.rows, args.queries)
+    queries = normalize(vectors[picks] + 0.01 * rng.standard_normal((args.queries, args.dim)))
+    exact = [set(np.argpartition(-(vectors @ query), args.k)[:args.k] + 1) for query in queries]
+
+    layouts = {
+        'float32': {},
+        'int8': {'quantize': True},
+        'ivf': {'ivf_lists': args.lists, 'probes': args.probes},
+        'ivf+int8': {'ivf_lists': args.lists, 'probes': args.probes, 'quantize': True},
+    }
+    print(f"{args.rows} rows of {args.dim} dims, {args.queries} queries, top {args.k}")
+    print(f"{'layout':<10}{'build s':>9}{'p50 ms':>9}{'p95 ms':>9}{'recall':>9}{'MB':>8}")
+    with tempfile.TemporaryDirectory(prefix='confseeker-search-') as workdir:
+        for name, options in layouts.items():
+            path = os.path.join(workdir, name)
+            index = SearchIndex(path, model_name='bench', ivf_min_rows=0, **options)
+            ids = np.arange(1, args.rows + 1)
+            start = time.perf_counter()
+            for offset in range(0, args.rows, 10000):
+                index.upsert(ids[offset:offset + 10000], np.zeros(len(ids[offset:offset + 10000]), dtype=np.uint32),
+                             vectors[offset:offset + 10000])
+            if options.get('ivf_lists'):
+                index.train()
+            build = time.perf_counter() - start
+
+            index.search(queries[0], args.k)
+            timings = []
+            found = 0
+            for query, expected in zip(queries, exact):
+                start = time.perf_counter()
+                hits = index.search(query, args.k)
+                timings.append((time.perf_counter() - start) * 1000)
+                found += len(expected & {conference_id for conference_id, _ in hits})
+            generation = index._current()
+            size = sum(os.path.getsize(os.path.join(generation.path, file)) for file in os.listdir(generation.path))
+            print(f"{name:<10}{build:>9.2f}{np.percentile(timings, 50):>9.2f}{np.percentile(timings, 95):>9.2f}"
+                  f"{found / (args.k * args.queries):>9.3f}{size / 2 ** 20:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
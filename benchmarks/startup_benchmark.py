@@ -0,0 +1,85 @@
+"""Measure API and tracker startup time and memory.
+
+Each measurement runs in a fresh interpreter so import caches do not leak
+between runs:
+
+    python benchmarks/startup_benchmark.py --runs 5
+    python benchmarks/startup_benchmark.py --preload   # PRELOAD_MODEL=true
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints one JSON line with its measurements
+CHILD = r'''
+import json, resource, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+response = client.get('/api/conferences')
+first_response = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    'import_s': imported - start,
+    'first_response_s': first_response - start,
+    'torch_loaded': 'torch' in sys.modules,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+}))
+'''
+
+MODEL_CHILD = r'''
+import json, resource, time
+import resources
+start = time.perf_counter()
+resources.preload()
+print(json.dumps({
+    'model_load_s': time.perf_counter() - start,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+}))
+'''
+
+
+def _run_child(code: str, env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _summarize(samples: list, key: str) -> str:
+    values = [sample[key] for sample in samples]
+    return f"median {statistics.median(values):.3f}  min {min(values):.3f}  max {max(values):.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--preload', action='store_true', help='measure with PRELOAD_MODEL=true')
+    parser.add_argument('--skip-model', action='store_true', help='do not measure model loading')
+    args = parser.parse_args()
+
+    env = dict(os.environ, SCHEDULER_ENABLED='false', PRELOAD_MODEL='true' if args.preload else 'false')
+
+    samples = [_run_child(CHILD, env) for _ in range(args.runs)]
+    print(f"API startup ({'preloaded' if args.preload else 'lazy'} model, {args.runs} runs)")
+    print(f"  import app (s):            {_summarize(samples, 'import_s')}")
+    print(f"  first GET conferences (s): {_summarize(samples, 'first_response_s')}")
+    print(f"  peak RSS (MB):             {_summarize(samples, 'peak_rss_mb')}")
+    print(f"  torch imported:            {any(sample['torch_loaded'] for sample in samples)}")
+
+    if not args.skip_model:
+        model_samples = [_run_child(MODEL_CHILD, env) for _ in range(args.runs)]
+        print(f"Model load ({args.runs} runs)")
+        print(f"  load (s):                  {_summarize(model_samples, 'model_load_s')}")
+        print(f"  peak RSS (MB):             {_summarize(model_samples, 'peak_rss_mb')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,226 +1,225 @@
 import os
-import json
 import time
 import schedule
-import requests
-from azure.servicebus import ServiceBusClient, ServiceBusMessage
-from azure.communication.email import EmailClient
-from bs4 import BeautifulSoup
 from datetime import datetime
-from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
-import pandas as pd
 from typing import List, Dict, Optional
 import re
-from urllib.parse import quote_plus
+from collections import Counter
+from scoring import BatchScorer
+from fetcher import FetchEngine
+from scheduler import StalenessScheduler, mentions_next_edition
+import sources
+import resources
+import metrics
+from storage import new_conference_id, open_store
+from keywords import KeywordMatcher
+import prefilter
+from dedup import SeenMatchIndex, dedupe_results, match_digest
+from notifications import NotificationDispatcher
 
 # Load environment variables
 load_dotenv()
 
 class ConferenceTracker:
     def __init__(self):
-        self.conferences_file = "conferences.json"
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.conferences = self._load_conferences()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        # Initialize Azure Service Bus client
-        self.servicebus_client = ServiceBusClient.from_connection_string(
-            os.getenv('AZURE_SERVICEBUS_CONNECTION_STRING')
-        )
-        self.notification_queue = self.servicebus_client.get_queue_client(
-            os.getenv('AZURE_SERVICEBUS_QUEUE_NAME')
-        )
-        # Initialize Azure Communication Services Email client
-        self.email_client = EmailClient.from_connection_string(
-            os.getenv('AZURE_COMMUNICATION_CONNECTION_STRING')
-        )
+        self.store = open_store()
+        self._conferences = None
+        self.scheduler = StalenessScheduler(key=lambda conference: conference['id'])
+        self.fetcher = FetchEngine()
+        self.seen_matches = SeenMatchIndex()
+        self.notifier = NotificationDispatcher()
+        self.prefilter = prefilter.LexicalPrefilter()
+        sweep_deadline = os.getenv('SWEEP_FETCH_DEADLINE')
+        self.sweep_deadline = float(sweep_deadline) if sweep_deadline else None
 
-    def _load_conferences(self) -> List[Dict]:
-        """Load conferences from JSON file."""
-        if os.path.exists(self.conferences_file):
-            with open(self.conferences_file, 'r') as f:
-                return json.load(f)
-        return []
+    # The model and Azure clients are process-wide and loaded on first use
+    @property
+    def scorer(self) -> BatchScorer:
+        return resources.get_scorer()
 
-    def _save_conferences(self):
-        """Save conferences to JSON file."""
-        with open(self.conferences_file, 'w') as f:
-            json.dump(self.conferences, f, indent=2)
+    @property
+    def conferences(self) -> List[Dict]:
+        """Conferences being tracked, streamed from the store on first access."""
+        if self._conferences is None:
+            self._conferences = list(self.store.load())
+            self.scheduler.load(self._conferences)
+        return self._conferences
 
     def add_conference(self, name: str, year: int, keywords: List[str], link: Optional[str] = None):
         """Add a new conference to track."""
-        conference = {
-            "name": name,
-            "year": year,
-            "keywords": keywords,
-            "link": link,
-            "last_checked": datetime.now().isoformat()
+        self.add_conferences([{"name": name, "year": year, "keywords": keywords, "link": link}])
+
+    def add_conferences(self, conferences: List[Dict]):
+        """Add many conferences to track, saving them once."""
+        added = []
+        for data in conferences:
+            conference = {
+                "id": new_conference_id(),
+                "name": data['name'],
+                "year": data['year'],
+                "keywords": data['keywords'],
+                "link": data.get('link'),
+                # Never checked, so the scheduler treats it as due immediately
+                "last_checked": None
+            }
+            added.append(conference)
+        self.conferences.extend(added)
+        for conference in added:
+            self.scheduler.push(conference)
+        self.store.put_many(added)
+
+    def _conference_key(self, conference: Dict) -> str:
+        """Return the key identifying a conference in the seen-matches index."""
+        return f"{conference['name']}|{conference['year']}"
+
+    def _search_queries(self, conference: Dict) -> Dict[str, List[str]]:
+        """Build the source URLs to query for a conference, grouped by kind."""
+        # Search query construction with year and keywords
+        search_query = f"{conference['name']} conference {conference['year'] + 1} {' '.join(conference['keywords'])}"
+        return {
+            'google': [sources.google_search_url(search_query)],
+            'websites': sources.conference_website_urls(conference)
         }
-        self.conferences.append(conference)
-        self._save_conferences()
-
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Calculate similarity between two texts using sentence transformers."""
-        embedding1 = self.model.encode(text1, convert_to_tensor=True)
-        embedding2 = self.model.encode(text2, convert_to_tensor=True)
-        similarity = embedding1 @ embedding2.T
-        return float(similarity[0][0])
-
-    def _search_google(self, query: str) -> List[Dict]:
-        """Search Google for conference information."""
-        results = []
-        encoded_query = quote_plus(query)
-        url = f"https://www.google.com/search?q={encoded_query}"
-        
-        try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Look for search results
-            for result in soup.select('div.g'):
-                title_elem = result.select_one('h3')
-                link_elem = result.select_one('a')
-                snippet_elem = result.select_one('div.VwiC3b')
-                
-                if title_elem and link_elem:
-                    results.append({
-                        'title': title_elem.get_text(),
-                        'link': link_elem.get('href'),
-                        'snippet': snippet_elem.get_text() if snippet_elem else '',
-                        'source': 'Google Search'
-                    })
-        except Exception as e:
-            print(f"Error searching Google: {e}")
-        
-        return results
 
-    def _search_conference_websites(self, conference: Dict) -> List[Dict]:
-        """Search common conference websites."""
+    def _parse_search_pages(self, conference: Dict, queries: Dict[str, List[str]],
+                            pages: Dict[str, Optional[str]]) -> List[Dict]:
+        """Parse fetched source pages into search results for a conference.
+
+        Results are ranked by how many of the conference's keywords they mention.
+        """
         results = []
-        next_year = conference['year'] + 1
-        
-        # List of common conference websites to check
-        websites = [
-            f"https://www.call4papers.com/search?q={quote_plus(conference['name'])}",
-            f"https://www.wikicfp.com/cfp/search?q={quote_plus(conference['name'])}"
-        ]
-        
-        for url in websites:
+        keywords = KeywordMatcher(conference['keywords'])
+        for url in queries['google'] + queries['websites']:
+            html = pages.get(url)
+            if html is None:
+                continue
             try:
-                response = requests.get(url, headers=self.headers)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Extract conference information based on website structure
-                for link in soup.find_all('a', href=True):
-                    if any(keyword.lower() in link.text.lower() for keyword in conference['keywords']):
-                        results.append({
-                            'title': link.text,
-                            'link': link['href'],
-                            'source': url
-                        })
+                if url in queries['google']:
+                    results.extend(sources.parse_google_results(html))
+                else:
+                    results.extend(sources.parse_website_links(html, url, keywords))
             except Exception as e:
-                print(f"Error searching {url}: {e}")
-        
-        return results
+                metrics.PARSE_ERRORS.inc()
+                print(f"Error parsing {url}: {e}")
+        results = dedupe_results(results)
+        return keywords.rank(results)
 
-    def _search_conference(self, conference: Dict) -> List[Dict]:
-        """Search for conference information using multiple sources."""
-        results = []
-        
-        # Search query construction with year and keywords
-        search_query = f"{conference['name']} conference {conference['year'] + 1} {' '.join(conference['keywords'])}"
-        
-        # Search Google
-        google_results = self._search_google(search_query)
-        results.extend(google_results)
-        
-        # Search conference websites
-        website_results = self._search_conference_websites(conference)
-        results.extend(website_results)
-        
-        return results
-
-    def _send_notification(self, conference: Dict, match: Dict):
-        """Send notification about a potential conference match using Azure Communication Services."""
-        try:
-            # Prepare email content
-            subject = f"Potential Conference Match: {conference['name']}"
-            body = f"""
-            A potential match has been found for the conference you're tracking:
-            
-            Original Conference: {conference['name']} ({conference['year']})
-            Found Match: {match['title']}
-            Source: {match['source']}
-            Link: {match['link']}
-            
-            Similarity Score: {self._calculate_similarity(conference['name'], match['title']):.2f}
-            """
-            
-            # Send email using Azure Communication Services
-            message = {
-                "content": {
-                    "subject": subject,
-                    "plainText": body,
-                    "html": body.replace('\n', '<br>')
-                },
-                "recipients": {
-                    "to": [{"address": os.getenv('NOTIFICATION_EMAIL')}]
-                },
-                "senderAddress": os.getenv('AZURE_COMMUNICATION_SENDER_EMAIL')
-            }
-            
-            # Send the email
-            self.email_client.send(message)
-            print(f"Email notification sent for {conference['name']}")
-            
-            # Also send to Service Bus for other potential integrations
-            servicebus_message = ServiceBusMessage(
-                json.dumps({
-                    "type": "conference_match",
-                    "conference_name": conference['name'],
-                    "conference_year": conference['year'],
-                    "match_title": match['title'],
-                    "source": match['source'],
-                    "link": match['link'],
-                    "similarity_score": self._calculate_similarity(conference['name'], match['title']),
-                    "timestamp": datetime.now().isoformat()
-                }),
-                content_type="application/json"
-            )
-            
-            self.notification_queue.send_messages(servicebus_message)
-            print(f"Service Bus notification sent for {conference['name']}")
-            
-        except Exception as e:
-            print(f"Error sending notification: {e}")
-
-    def check_conferences(self):
-        """Check all conferences for updates."""
-        for conference in self.conferences:
-            print(f"Checking conference: {conference['name']}")
-            results = self._search_conference(conference)
-            
-            for result in results:
-                similarity = self._calculate_similarity(
-                    conference['name'],
-                    result['title']
-                )
-                
-                if similarity > float(os.getenv('SIMILARITY_THRESHOLD', 0.7)):
+    def _search_all_conferences(self, conferences: List[Dict]) -> List[List[Dict]]:
+        """Search all sources for all conferences concurrently."""
+        queries = [self._search_queries(conference) for conference in conferences]
+        urls = [url for query in queries for url in query['google'] + query['websites']]
+        pages = self.fetcher.fetch_all(urls, deadline=self.sweep_deadline)
+        return [
+            self._parse_search_pages(conference, query, pages)
+            for conference, query in zip(conferences, queries)
+        ]
+
+    def _check_chunk(self, conferences: List[Dict], threshold: float, prefilter_stats: Counter) -> List[bytes]:
+        """Search, score and update a chunk of conferences; return the digests of its matches."""
+        # Drop results that were already notified in earlier runs
+        # and results the lexical prefilter rules out before they reach the model
+        batches = [
+            (conference, self.prefilter.filter(
+                conference,
+                self.seen_matches.filter_unseen(self._conference_key(conference), results),
+                prefilter_stats
+            ))
+            for conference, results in zip(conferences, self._search_all_conferences(conferences))
+        ]
+
+        # Score every result of the chunk in one batch
+        all_scores = self.scorer.score_results(
+            [(conference['name'], results) for conference, results in batches]
+        )
+
+        notified = []
+        for (conference, results), scores in zip(batches, all_scores):
+            for result, similarity in zip(results, scores):
+                if similarity > threshold:
                     print(f"Potential match found for {conference['name']}")
-                    self._send_notification(conference, result)
-                    
+                    self.notifier.add(conference['name'], conference['year'], result, similarity)
+                    metrics.MATCHES.inc()
+                    notified.append(match_digest(self._conference_key(conference), result['link']))
+                    if mentions_next_edition(conference['year'], result):
+                        conference['next_edition_found'] = True
+
             conference['last_checked'] = datetime.now().isoformat()
-        
-        self._save_conferences()
+            self.scheduler.push(conference)
+        return notified
+
+    def check_conferences(self, conferences: Optional[List[Dict]] = None):
+        """Check conferences for updates, all of them by default.
+
+        Conferences are checked in chunks of ``CHECK_CHUNK_SIZE``, and each
+        chunk is saved as soon as it is done, so a crash mid-sweep keeps the
+        chunks already checked.
+        """
+        if conferences is None:
+            conferences = self.conferences
+        threshold = float(os.getenv('SIMILARITY_THRESHOLD', 0.7))
+        chunk_size = int(os.getenv('CHECK_CHUNK_SIZE', 25))
+        print(f"Checking {len(conferences)} conferences")
+        metrics_before = metrics.snapshot()
+        started = time.perf_counter()
+        prefilter_stats = Counter()
+        stats_before = self.scorer.cache_stats()
+        notified = []
+        for start in range(0, len(conferences), chunk_size):
+            chunk = conferences[start:start + chunk_size]
+            notified.extend(self._check_chunk(chunk, threshold, prefilter_stats))
+            self.store.put_many(chunk)
+        stats_after = self.scorer.cache_stats()
+
+        # Send one digest for the whole run in the background and record its
+        # matches as seen only once it was delivered
+        self.notifier.flush().add_done_callback(lambda sent: self._record_notified(sent, notified))
+        metrics.CONFERENCES_CHECKED.inc(len(conferences))
+
+        changes = metrics.delta(metrics_before)
+        fetches, fetch_seconds = changes['confseeker_fetch_seconds']
+        pages, parse_seconds = changes['confseeker_parse_seconds']
+        encode_batches, encode_seconds = changes['confseeker_encode_seconds']
+        _, texts = changes['confseeker_encode_batch_size']
+        print(f"Sweep summary: {len(conferences)} conferences in {time.perf_counter() - started:.1f}s | "
+              f"fetch {fetches:.0f} pages in {fetch_seconds:.1f}s, "
+              f"{changes['confseeker_fetch_errors_total'][0]:.0f} errors | "
+              f"parse {pages:.0f} pages in {parse_seconds:.1f}s, "
+              f"{changes['confseeker_parse_errors_total'][0]:.0f} errors | "
+              f"prefilter {prefilter.describe(prefilter_stats)} | "
+              f"encode {texts:.0f} texts in {encode_batches:.0f} batches, {encode_seconds:.2f}s | "
+              f"embedding cache {stats_after['hits'] - stats_before['hits']} hits, "
+              f"{stats_after['misses'] - stats_before['misses']} misses | "
+              f"{len(notified)} matches")
+
+    def _record_notified(self, sent, digests: List[bytes]):
+        if sent.exception() is not None:
+            print(f"Matches will be notified again on the next check: {sent.exception()}")
+            return
+        self.seen_matches.add_many(digests)
+
+    def check_due_conferences(self):
+        """Check the slice of conferences that are currently due."""
+        # Loading the conferences on the first tick fills the schedule
+        if not self.conferences:
+            return
+        due = self.scheduler.pop_due()
+        if not due:
+            return
+        try:
+            self.check_conferences(due)
+        except Exception as e:
+            print(f"Error checking due conferences: {e}")
+            # Put the slice back so it is retried on the next tick
+            for conference in due:
+                self.scheduler.push(conference)
 
 def main():
     tracker = ConferenceTracker()
     
-    # Schedule weekly checks
-    schedule.every().monday.at("00:00").do(tracker.check_conferences)
+    # Check a slice of due conferences on every tick
+    tick_minutes = float(os.getenv('SCHEDULER_TICK_MINUTES', 60))
+    schedule.every(tick_minutes).minutes.do(tracker.check_due_conferences)
     
     while True:
         schedule.run_pending()
@@ -0,0 +1,118 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Iterable, List
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that only track the click and never change the page:
+# any utm_* parameter, and these exact names
+_TRACKING_PREFIX = 'utm_'
+_TRACKING_PARAMS = frozenset(('fbclid', 'gclid', 'ved', 'usg', 'sa', 'ei'))
+
+DIGEST_SIZE = 8
+
+
+def _is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key.startswith(_TRACKING_PREFIX) or key in _TRACKING_PARAMS
+
+
+def normalize_url(url: str, base: str = None) -> str:
+    """Normalize a result URL so the same page found through different sources compares equal.
+
+    Relative links are resolved against ``base``, the page they were found
+    on; without one they are returned unchanged rather than collapsed onto
+    an empty host.
+    """
+    if not url:
+        return ''
+    url = url.strip()
+    parts = urlsplit(url)
+    if not parts.netloc:
+        if not base:
+            return url
+        url = urljoin(base, url)
+        parts = urlsplit(url)
+
+    # Unwrap Google redirect links (/url?q=<target>)
+    if parts.path == '/url':
+        params = dict(parse_qsl(parts.query))
+        target = params.get('q') or params.get('url')
+        if target:
+            return normalize_url(target, base)
+
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not _is_tracking_param(key)
+    ))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower() or 'http', host, path, query, ''))
+
+
+def match_digest(conference_key, url: str) -> bytes:
+    """Return the compact digest identifying a (conference, normalized URL) match."""
+    data = f"{conference_key}|{normalize_url(url)}".encode('utf-8')
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def dedupe_results(results: Iterable[Dict]) -> List[Dict]:
+    """Drop results whose normalized URL was already seen earlier in the list."""
+    seen = set()
+    unique = []
+    for result in results:
+        key = normalize_url(result.get('link') or '') or result.get('title')
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(result)
+    return unique
+
+
+class SeenMatchIndex:
+    """Persisted set of matches that were already notified.
+
+    Each match is stored as a fixed-size digest of the conference key and the
+    normalized URL, appended to a binary file so recording new matches never
+    rewrites the index.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv('SEEN_MATCHES_PATH', 'seen_matches.bin')
+        self._lock = threading.Lock()
+        self._digests = set()
+        if os.path.exists(self.path):
+            with open(self.path, 'rb+') as f:
+                data = f.read()
+                usable = len(data) - len(data) % DIGEST_SIZE
+                if usable < len(data):
+                    # Drop a record torn by a crash so later appends stay aligned
+                    f.truncate(usable)
+            self._digests = {data[i:i + DIGEST_SIZE] for i in range(0, usable, DIGEST_SIZE)}
+
+    def __contains__(self, digest: bytes) -> bool:
+        return digest in self._digests
+
+    def __len__(self):
+        return len(self._digests)
+
+    def filter_unseen(self, conference_key, results: Iterable[Dict]) -> List[Dict]:
+        """Return the results that have not been notified for this conference yet."""
+        return [
+            result for result in results
+            if match_digest(conference_key, result.get('link') or '') not in self._digests
+        ]
+
+    def add_many(self, digests: Iterable[bytes]):
+        """Record matches as seen, appending only the new digests to the file."""
+        with self._lock:
+            new = [digest for digest in dict.fromkeys(digests) if digest not in self._digests]
+            if not new:
+                return
+            with open(self.path, 'ab') as f:
+                f.write(b''.join(new))
+                f.flush()
+                os.fsync(f.fileno())
+            self._digests.update(new)
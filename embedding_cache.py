@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+import numpy as np
+from typing import Dict, Iterable
+import metrics
+
+# SQLite limits the number of bound parameters per statement
+_CHUNK_SIZE = 500
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text into the key used by the embedding cache."""
+    return ' '.join(unicodedata.normalize('NFKC', text).split())
+
+
+class EmbeddingCache:
+    """Size-bounded, on-disk LRU cache of text embeddings.
+
+    Embeddings are stored as float32 blobs in a SQLite table keyed by model
+    name and normalized text, so repeat sweeps only run the transformer on
+    texts that have not been seen before.
+    """
+
+    def __init__(self, path: str = None, max_entries: int = None):
+        self.path = path or os.getenv('EMBEDDING_CACHE_PATH', 'embeddings.db')
+        self.max_entries = max_entries or int(os.getenv('EMBEDDING_CACHE_MAX_ENTRIES', 200000))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_key TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_key)
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)')
+        self._conn.commit()
+
+    def get_many(self, model_name: str, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return cached embeddings for the given normalized keys and mark them as used."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _CHUNK_SIZE):
+                chunk = keys[start:start + _CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT text_key, vector FROM embeddings WHERE model = ? AND text_key IN ({placeholders})',
+                    [model_name, *chunk]
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    'UPDATE embeddings SET last_used = ? WHERE model = ? AND text_key = ?',
+                    [(now, model_name, key) for key in found]
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        metrics.EMBEDDING_CACHE.inc(len(found), result='hit')
+        metrics.EMBEDDING_CACHE.inc(len(keys) - len(found), result='miss')
+        return found
+
+    def put_many(self, model_name: str, embeddings: Dict[str, np.ndarray]):
+        """Store embeddings for normalized keys, evicting the least recently used rows."""
+        if not embeddings:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO embeddings (model, text_key, vector, last_used) VALUES (?, ?, ?, ?)',
+                [
+                    (model_name, key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, vector in embeddings.items()
+                ]
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Delete the least recently used rows beyond ``max_entries``."""
+        (count,) = self._conn.execute('SELECT COUNT(*) FROM embeddings').fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                'DELETE FROM embeddings WHERE rowid IN '
+                '(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)',
+                (overflow,)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters since the cache was opened."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,94 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+from http_client import HttpClient, get_http_client
+import metrics
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class FetchEngine:
+    """Bounded thread-pool engine that fetches many URLs concurrently.
+
+    Each host gets its own small pool so a slow host cannot starve the others,
+    and a global semaphore caps the number of requests in flight. A sweep
+    therefore takes about as long as its slowest host instead of the sum of
+    all requests.
+    """
+
+    def __init__(self, max_concurrency: int = None, per_host_limit: int = None,
+                 timeout: float = None, headers: Optional[Dict[str, str]] = None,
+                 client: Optional[HttpClient] = None):
+        self.max_concurrency = max_concurrency or int(os.getenv('FETCH_CONCURRENCY', 16))
+        self.per_host_limit = per_host_limit or int(os.getenv('FETCH_PER_HOST_LIMIT', 4))
+        self.timeout = timeout or float(os.getenv('FETCH_TIMEOUT', 10))
+        self.client = client or get_http_client(headers or DEFAULT_HEADERS)
+        self._global_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._host_pools: Dict[str, ThreadPoolExecutor] = {}
+        self._pools_lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def _pool_for(self, url: str) -> ThreadPoolExecutor:
+        host = urlsplit(url).netloc
+        with self._pools_lock:
+            if host not in self._host_pools:
+                self._host_pools[host] = ThreadPoolExecutor(
+                    max_workers=self.per_host_limit,
+                    thread_name_prefix=f"fetch-{host}"
+                )
+            return self._host_pools[host]
+
+    def _stopped(self, cancelled: Optional[threading.Event]) -> bool:
+        return self._cancelled.is_set() or (cancelled is not None and cancelled.is_set())
+
+    def fetch(self, url: str, cancelled: Optional[threading.Event] = None) -> Optional[str]:
+        """Fetch a single URL and return its body, or None on error or cancellation.
+
+        ``cancelled`` is the calling sweep's own token; setting it stops only
+        that sweep's pending requests.
+        """
+        if self._stopped(cancelled):
+            return None
+        with self._global_slots:
+            if self._stopped(cancelled):
+                return None
+            host = urlsplit(url).netloc
+            try:
+                with metrics.FETCH_SECONDS.time(host=host):
+                    return self.client.get_text(url, timeout=self.timeout)
+            except Exception as e:
+                metrics.FETCH_ERRORS.inc(host=host)
+                print(f"Error fetching {url}: {e}")
+                return None
+
+    def fetch_all(self, urls: Iterable[str], deadline: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """Fetch all URLs concurrently and return their bodies keyed by URL.
+
+        Requests still pending after ``deadline`` seconds are cancelled and
+        reported as None. Cancellation is scoped to this call, so sweeps
+        sharing the engine never cancel each other's requests.
+        """
+        cancelled = threading.Event()
+        futures = {url: self._pool_for(url).submit(self.fetch, url, cancelled) for url in dict.fromkeys(urls)}
+        done, not_done = wait(futures.values(), timeout=deadline)
+        cancelled.set()
+        for future in not_done:
+            future.cancel()
+        if not_done:
+            print(f"Cancelled {len(not_done)} fetches after {deadline}s")
+        return {url: future.result() if future in done else None for url, future in futures.items()}
+
+    def cancel(self):
+        """Stop issuing new requests for good, on shutdown; requests already on the wire run to their timeout."""
+        self._cancelled.set()
+
+    def close(self):
+        self.cancel()
+        with self._pools_lock:
+            for pool in self._host_pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            self._host_pools.clear()
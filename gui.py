@@ -4,9 +4,14 @@ import json
 from typing import List, Dict
 import os
 from datetime import datetime
-import requests
+from gui_client import ApiClient
+from gui_table import TableModel, TableView, date_key, float_key, int_key
 
 API_URL = os.getenv('API_URL', 'http://localhost:5000/api')
+# Longest id list sent in a bulk delete's query string
+MAX_IDS_QUERY_LENGTH = 2000
+# Pause in typing before the filter is applied
+FILTER_DEBOUNCE_MS = 150
 
 class ModernButton(ttk.Button):
     def __init__(self, master=None, **kwargs):
@@ -32,6 +37,7 @@ class ConferenceTrackerGUI:
         self.setup_styles()
         
         self.editing_id = None  # Track which conference is being edited
+        self.conferences_etag = None  # ETag of the last conference list load
         
         # Create main container with padding
         self.main_container = ttk.Frame(self.root, padding="20")
@@ -54,6 +60,13 @@ class ConferenceTrackerGUI:
         # Create search results section
         self.create_search_results()
         
+        # API requests run on worker threads so the window never blocks on the network
+        self.api = ApiClient(self.root, API_URL)
+        self.load_call = None  # In-flight conference list load
+        self.check_call = None  # Check job event stream
+        self.check_running = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Load existing conferences
         self.load_conferences()
 
@@ -211,6 +224,7 @@ class ConferenceTrackerGUI:
                  style='Input.TLabel').grid(row=0, column=0, padx=5)
         
         self.filter_var = tk.StringVar()
+        self.filter_after = None
         self.filter_var.trace('w', self.apply_filter)
         self.filter_entry = ttk.Entry(filter_frame,
                                     textvariable=self.filter_var,
@@ -225,14 +239,16 @@ class ConferenceTrackerGUI:
                                 show="headings",
                                 style='Modern.Treeview')
         
-        # Set column headings and bind sorting
+        # Set column headings
         for col in columns:
-            self.tree.heading(col, text=col, command=lambda c=col: self.sort_treeview(c))
+            self.tree.heading(col, text=col)
             self.tree.column(col, width=150)
         
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Add scrollbar; only the visible rows are rendered, sorting is bound to the headings
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        self.conference_table = TableView(self.tree, scrollbar, TableModel(
+            columns, sort_keys={"Year": int_key, "Last Checked": date_key}
+        ))
         
         # Grid layout
         self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -284,34 +300,56 @@ class ConferenceTrackerGUI:
             self.results_tree.column(col, width=150)
         
         # Add scrollbar
-        results_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
-        self.results_tree.configure(yscrollcommand=results_scrollbar.set)
+        results_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL)
+        self.results_table = TableView(self.results_tree, results_scrollbar, TableModel(
+            columns, sort_keys={"Similarity": float_key}
+        ))
         
         # Grid layout
         self.results_tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         results_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
 
+    def report_error(self, message):
+        """Return an error callback showing ``message`` with the exception."""
+        return lambda e: messagebox.showerror("Error", f"{message}: {str(e)}")
+
+    def on_close(self):
+        self.api.close()
+        self.root.destroy()
+
     def load_conferences(self):
-        try:
-            response = requests.get(f"{API_URL}/conferences")
-            conferences = response.json()
-            
-            # Clear existing items
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Load conferences from API
-            for conf in conferences:
-                self.tree.insert("", tk.END, values=(
-                    conf["name"],
-                    conf["year"],
-                    ", ".join(conf["keywords"]),
-                    conf.get("link", ""),
-                    conf["last_checked"],
-                    conf["status"]
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load conferences: {str(e)}")
+        """Reload the conference list in the background, superseding a load still in flight."""
+        if self.load_call is not None:
+            self.load_call.cancel()
+        headers = {'If-None-Match': self.conferences_etag} if self.conferences_etag else {}
+        
+        def fetch(call):
+            response = self.api.session.get(f"{API_URL}/conferences", headers=headers, timeout=self.api.timeout)
+            if response.status_code == 304:
+                # Nothing changed since the last load
+                return None
+            response.raise_for_status()
+            return response.headers.get('ETag'), response.json()
+        
+        self.load_call = self.api.submit(fetch, on_success=self.show_conferences,
+                                         on_error=self.report_error("Failed to load conferences"))
+
+    def show_conferences(self, loaded):
+        if loaded is None:
+            return
+        self.conferences_etag, conferences = loaded
+        
+        # Update only the rows that changed; rows are identified by conference id
+        self.conference_table.replace({
+            str(conf["id"]): (
+                conf["name"],
+                conf["year"],
+                ", ".join(conf["keywords"]),
+                conf.get("link", ""),
+                conf["last_checked"],
+                conf["status"]
+            ) for conf in conferences
+        })
 
     def add_conference(self):
         try:
@@ -321,33 +359,34 @@ class ConferenceTrackerGUI:
                 "keywords": [k.strip() for k in self.keywords_var.get().split(",")],
                 "link": self.link_var.get().strip() or None
             }
-            
-            if not data["name"] or not data["year"] or not data["keywords"]:
-                messagebox.showerror("Error", "Please fill in all required fields")
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid year")
+            return
+        
+        if not data["name"] or not data["year"] or not data["keywords"]:
+            messagebox.showerror("Error", "Please fill in all required fields")
+            return
+        
+        if self.editing_id is not None:
+            # Update existing conference
+            method, path, expected, failure = 'PUT', f"/conferences/{self.editing_id}", 200, "Failed to update conference"
+        else:
+            # Add new conference
+            method, path, expected, failure = 'POST', "/conferences", 201, "Failed to add conference"
+        
+        def saved(response):
+            if response.status_code != expected:
+                messagebox.showerror("Error", f"An error occurred: {failure}")
                 return
-            
-            if self.editing_id is not None:
-                # Update existing conference
-                response = requests.put(f"{API_URL}/conferences/{self.editing_id}", json=data)
-                if response.status_code != 200:
-                    raise Exception("Failed to update conference")
-            else:
-                # Add new conference
-                response = requests.post(f"{API_URL}/conferences", json=data)
-                if response.status_code != 201:
-                    raise Exception("Failed to add conference")
-            
             self.editing_id = None
             self.add_button.configure(text="Add Conference")
             self.cancel_button.configure(state='disabled')
             self.load_conferences()
             self.clear_input_fields()
             messagebox.showinfo("Success", "Conference saved successfully!")
-            
-        except ValueError:
-            messagebox.showerror("Error", "Please enter a valid year")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        
+        self.api.request(method, path, json=data, on_success=saved,
+                         on_error=self.report_error("An error occurred"))
 
     def clear_input_fields(self):
         self.name_var.set("")
@@ -356,31 +395,27 @@ class ConferenceTrackerGUI:
         self.link_var.set("")
 
     def edit_conference(self):
-        selected = self.tree.selection()
+        selected = self.conference_table.selection()
         if not selected:
             messagebox.showwarning("Warning", "Please select a conference to edit")
             return
         
-        item = selected[0]
-        values = self.tree.item(item)["values"]
-        
         # Get conference details from API
-        try:
-            response = requests.get(f"{API_URL}/conferences")
-            conferences = response.json()
-            
-            for conf in conferences:
-                if conf["name"] == values[0]:
-                    self.editing_id = conf["id"]
-                    self.name_var.set(conf["name"])
-                    self.year_var.set(str(conf["year"]))
-                    self.keywords_var.set(", ".join(conf["keywords"]))
-                    self.link_var.set(conf.get("link", ""))
-                    self.add_button.configure(text="Update Conference")
-                    self.cancel_button.configure(state='normal')
-                    break
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load conference details: {str(e)}")
+        def show_details(response):
+            if response.status_code != 200:
+                messagebox.showerror("Error", "Failed to load conference details: conference not found")
+                return
+            conf = response.json()
+            self.editing_id = conf["id"]
+            self.name_var.set(conf["name"])
+            self.year_var.set(str(conf["year"]))
+            self.keywords_var.set(", ".join(conf["keywords"]))
+            self.link_var.set(conf["link"] or "")
+            self.add_button.configure(text="Update Conference")
+            self.cancel_button.configure(state='normal')
+        
+        self.api.request('GET', f"/conferences/{selected[0]}", on_success=show_details,
+                         on_error=self.report_error("Failed to load conference details"))
 
     def cancel_edit(self):
         self.editing_id = None
@@ -389,79 +424,91 @@ class ConferenceTrackerGUI:
         self.cancel_button.configure(state='disabled')
 
     def delete_conference(self):
-        selected = self.tree.selection()
+        selected = self.conference_table.selection()
         if not selected:
             messagebox.showwarning("Warning", "Please select a conference to delete")
             return
         
-        if messagebox.askyesno("Confirm", "Are you sure you want to delete the selected conference(s)?"):
-            try:
-                for item in selected:
-                    values = self.tree.item(item)["values"]
-                    name = values[0]
-                    
-                    # Get conference ID from API
-                    response = requests.get(f"{API_URL}/conferences")
-                    conferences = response.json()
-                    
-                    for conf in conferences:
-                        if conf["name"] == name:
-                            delete_response = requests.delete(f"{API_URL}/conferences/{conf['id']}")
-                            if delete_response.status_code != 204:
-                                raise Exception(f"Failed to delete conference: {name}")
-                
-                self.load_conferences()
-                messagebox.showinfo("Success", "Selected conference(s) deleted successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete conferences: {str(e)}")
-
-    def sort_treeview(self, col):
-        """Sort treeview when clicking on column headers."""
-        items = [(self.tree.set(item, col), item) for item in self.tree.get_children('')]
-        items.sort()
+        if not messagebox.askyesno("Confirm", "Are you sure you want to delete the selected conference(s)?"):
+            return
+        ids = ",".join(selected)
+        if len(ids) <= MAX_IDS_QUERY_LENGTH:
+            request_args = {"params": {"ids": ids}}
+        else:
+            # Too long for the request line; send the ids in the body instead
+            request_args = {"json": {"ids": [int(item) for item in selected]}}
+        
+        def deleted(response):
+            if response.status_code != 200:
+                messagebox.showerror("Error", "Failed to delete conferences")
+                return
+            self.conference_table.remove(selected)
+            messagebox.showinfo("Success", "Selected conference(s) deleted successfully!")
         
-        for index, (val, item) in enumerate(items):
-            self.tree.move(item, '', index)
+        # Delete every selected conference in one request
+        self.api.request('DELETE', "/conferences", on_success=deleted,
+                         on_error=self.report_error("Failed to delete conferences"), **request_args)
 
     def apply_filter(self, *args):
-        """Filter treeview based on search text."""
-        search_text = self.filter_var.get().lower()
-        
-        for item in self.tree.get_children():
-            values = self.tree.item(item)["values"]
-            if any(search_text in str(value).lower() for value in values):
-                self.tree.reattach(item, '', 'end')
-            else:
-                self.tree.detach(item)
+        """Filter the conference list once typing pauses."""
+        if self.filter_after is not None:
+            self.root.after_cancel(self.filter_after)
+        self.filter_after = self.root.after(FILTER_DEBOUNCE_MS, self.run_filter)
+
+    def run_filter(self):
+        self.filter_after = None
+        self.conference_table.set_filter(self.filter_var.get())
 
     def check_conferences_now(self):
-        """Check all conferences immediately and show results."""
-        try:
-            # Clear previous results
-            for item in self.results_tree.get_children():
-                self.results_tree.delete(item)
-            
-            # Trigger conference check
-            response = requests.post(f"{API_URL}/conferences/check")
-            if response.status_code != 200:
-                raise Exception("Failed to check conferences")
-            
-            results = response.json()
-            
-            # Update results tree
-            for result in results:
-                self.results_tree.insert("", tk.END, values=(
-                    result['title'],
-                    result['source'],
-                    result['link'],
-                    f"{result['similarity']:.2f}"
-                ))
-            
-            # Reload conferences to update status
-            self.load_conferences()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to check conferences: {str(e)}")
+        """Start a background check of all conferences and follow its event stream."""
+        # Clear previous results
+        self.results_table.clear()
+        self.check_button.configure(state='disabled')
+        self.check_running = True
+        
+        def started(response):
+            if response.status_code != 202:
+                self.check_failed(Exception("Failed to check conferences"))
+                return
+            job = response.json()
+            self.check_call = self.api.stream("/conferences/check/stream", params={"job": job['id']},
+                                              on_event=self.handle_check_event,
+                                              on_success=self.check_stream_ended,
+                                              on_error=self.check_failed)
+        
+        # Trigger conference check
+        self.check_call = self.api.request('POST', "/conferences/check", on_success=started,
+                                           on_error=self.check_failed)
+
+    def check_failed(self, error):
+        self.check_running = False
+        self.check_button.configure(state='normal')
+        messagebox.showerror("Error", f"Failed to check conferences: {str(error)}")
+
+    def handle_check_event(self, event):
+        """Apply one check job event: a match, a conference status change or job progress."""
+        if event['event'] == 'match':
+            self.results_table.add(str(len(self.results_table.model)), (
+                event['title'],
+                event['source'],
+                event['link'],
+                f"{event['similarity']:.2f}"
+            ))
+        elif event['event'] == 'status':
+            changes = {"Status": event['status']}
+            if event['last_checked']:
+                changes["Last Checked"] = event['last_checked']
+            self.conference_table.update(str(event['conference_id']), changes)
+        elif event['event'] == 'job' and event['status'] not in ('queued', 'running'):
+            self.check_running = False
+            self.check_button.configure(state='normal')
+            if event['status'] == 'failed':
+                messagebox.showerror("Error", f"Failed to check conferences: {event['error'] or 'Check job failed'}")
+
+    def check_stream_ended(self, _):
+        # The stream closes after the job's final event; anything else means it was cut off
+        if self.check_running:
+            self.check_failed(Exception("Lost connection to the check job"))
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,135 @@
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+DRAIN_INTERVAL_MS = 50
+
+
+class ApiCall:
+    """Handle to a request running on the client's worker threads."""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Cancel the call; a request already on the wire finishes but its callbacks never run."""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class ApiClient:
+    """Runs API requests off the Tk event thread.
+
+    Requests run on a small pool of worker threads sharing one pooled
+    ``requests.Session``. Their callbacks are queued and run on the Tk thread
+    by a ``root.after`` loop, since Tk widgets must only be touched from the
+    thread that created them.
+    """
+
+    def __init__(self, root, base_url: str, workers: int = 4, timeout: float = 30):
+        self.root = root
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gui-api')
+        self._callbacks = queue.Queue()
+        self._calls = set()
+        self._closed = False
+        self.root.after(DRAIN_INTERVAL_MS, self._drain)
+
+    def _drain(self):
+        """Run queued callbacks on the Tk thread.
+
+        A failing callback is reported and skipped, so it neither drops the
+        callbacks queued behind it nor stops the drain loop.
+        """
+        try:
+            while True:
+                try:
+                    call, callback, args = self._callbacks.get_nowait()
+                except queue.Empty:
+                    break
+                if call.cancelled:
+                    continue
+                try:
+                    callback(*args)
+                except Exception as e:
+                    print(f"Error in API callback {getattr(callback, '__name__', callback)}: {e}")
+        finally:
+            if not self._closed:
+                self.root.after(DRAIN_INTERVAL_MS, self._drain)
+
+    def _post(self, call: ApiCall, callback: Optional[Callable], *args):
+        if callback is not None and not call.cancelled:
+            self._callbacks.put((call, callback, args))
+
+    def submit(self, func: Callable, on_success: Optional[Callable] = None,
+               on_error: Optional[Callable] = None) -> ApiCall:
+        """Run ``func(call)`` on a worker and pass its return value or exception back on the Tk thread."""
+        call = ApiCall()
+
+        def run():
+            try:
+                result = func(call)
+            except Exception as e:
+                self._post(call, on_error, e)
+            else:
+                self._post(call, on_success, result)
+            finally:
+                self._calls.discard(call)
+
+        self._calls.add(call)
+        call.future = self._executor.submit(run)
+        return call
+
+    def request(self, method: str, path: str, on_success: Optional[Callable] = None,
+                on_error: Optional[Callable] = None, **kwargs) -> ApiCall:
+        """Send a request to ``base_url + path`` and pass the response to ``on_success``."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.submit(
+            lambda call: self.session.request(method, f"{self.base_url}{path}", **kwargs),
+            on_success, on_error
+        )
+
+    def stream(self, path: str, on_event: Callable, on_success: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs) -> ApiCall:
+        """Read an NDJSON stream from ``base_url + path``, passing each event to ``on_event``.
+
+        Events are delivered on the Tk thread in the order they arrive;
+        ``on_success`` runs once the server ends the stream. ``timeout`` is
+        the longest wait for the next line, so the server must send
+        heartbeats more often than that.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+
+        def read(call):
+            with self.session.get(f"{self.base_url}{path}", stream=True, **kwargs) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if call.cancelled:
+                        return
+                    if line:
+                        self._post(call, on_event, json.loads(line))
+
+        return self.submit(read, on_success, on_error)
+
+    def close(self):
+        """Cancel every pending call and stop the workers."""
+        self._closed = True
+        for call in list(self._calls):
+            call.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
@@ -0,0 +1,305 @@
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from tkinter import ttk
+
+# Rows moved per mouse wheel notch
+WHEEL_ROWS = 3
+
+
+def text_key(value):
+    return str(value).casefold()
+
+
+def int_key(value):
+    try:
+        return (0, int(value))
+    except (TypeError, ValueError):
+        return (1, 0)
+
+
+def float_key(value):
+    try:
+        return (0, float(value))
+    except (TypeError, ValueError):
+        return (1, 0.0)
+
+
+def date_key(value):
+    try:
+        return (0, datetime.fromisoformat(value))
+    except (TypeError, ValueError):
+        return (1, datetime.min)
+
+
+class TableModel:
+    """Rows of a table keyed by id, with a filtered and sorted view of their ids.
+
+    Each row's sort keys and lowercase search text are computed once when it
+    is stored, so sorting and filtering never re-parse display values. A
+    filter that extends the previous one only searches the previous matches.
+    """
+
+    def __init__(self, columns: Sequence[str], sort_keys: Optional[Dict[str, Callable]] = None):
+        self.columns = tuple(columns)
+        self._key_funcs = [(sort_keys or {}).get(column, text_key) for column in self.columns]
+        self.rows: Dict[str, tuple] = {}
+        self._sort_keys: Dict[str, tuple] = {}
+        self._search_text: Dict[str, str] = {}
+        self.filter_text = ''
+        self.sort_column: Optional[str] = None
+        self.sort_descending = False
+        self._view: Optional[List[str]] = None
+        self._matches = None  # (filter text, matching ids) of the last filter
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _store(self, row_id: str, values: Sequence) -> bool:
+        values = tuple('' if value is None else value for value in values)
+        if self.rows.get(row_id) == values:
+            return False
+        self.rows[row_id] = values
+        self._sort_keys[row_id] = tuple(key(value) for key, value in zip(self._key_funcs, values))
+        self._search_text[row_id] = '\x1f'.join(str(value).casefold() for value in values)
+        return True
+
+    def _discard(self, row_id: str):
+        del self.rows[row_id], self._sort_keys[row_id], self._search_text[row_id]
+
+    def _changed(self):
+        self._view = None
+        self._matches = None
+
+    def replace(self, rows: Dict[str, Sequence]) -> bool:
+        """Make the model hold exactly ``rows``, touching only rows that differ.
+
+        Returns whether anything changed.
+        """
+        removed = [row_id for row_id in self.rows if row_id not in rows]
+        for row_id in removed:
+            self._discard(row_id)
+        changed = bool(removed)
+        for row_id, values in rows.items():
+            changed = self._store(row_id, values) or changed
+        if changed:
+            self._changed()
+        return changed
+
+    def set(self, row_id: str, values: Sequence) -> bool:
+        if not self._store(row_id, values):
+            return False
+        self._changed()
+        return True
+
+    def update(self, row_id: str, changes: Dict[str, object]) -> bool:
+        """Change some columns of a row; unknown rows are ignored."""
+        if row_id not in self.rows:
+            return False
+        values = list(self.rows[row_id])
+        for column, value in changes.items():
+            values[self.columns.index(column)] = value
+        return self.set(row_id, values)
+
+    def remove(self, row_ids: Iterable[str]) -> bool:
+        removed = [row_id for row_id in row_ids if row_id in self.rows]
+        for row_id in removed:
+            self._discard(row_id)
+        if removed:
+            self._changed()
+        return bool(removed)
+
+    def clear(self):
+        self.replace({})
+
+    def set_filter(self, text: str) -> bool:
+        """Show only rows with a column containing ``text``, ignoring case."""
+        text = text.strip().casefold()
+        if text == self.filter_text:
+            return False
+        self.filter_text = text
+        self._view = None
+        return True
+
+    def sort_by(self, column: str):
+        """Sort by a column, reversing the order if it is already sorted by it."""
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column, self.sort_descending = column, False
+        self._view = None
+
+    def view(self) -> List[str]:
+        """Return the ids of the rows passing the filter, in sort order."""
+        if self._view is None:
+            row_ids = self._filtered()
+            if self.sort_column is not None:
+                index = self.columns.index(self.sort_column)
+                row_ids = sorted(row_ids, key=lambda row_id: self._sort_keys[row_id][index],
+                                 reverse=self.sort_descending)
+            self._view = row_ids
+        return self._view
+
+    def _filtered(self) -> List[str]:
+        text = self.filter_text
+        if not text:
+            matches = list(self.rows)
+        else:
+            candidates = self.rows
+            if self._matches is not None and self._matches[0] in text:
+                # A longer filter can only match a subset of the previous one
+                candidates = self._matches[1]
+            matches = [row_id for row_id in candidates if text in self._search_text[row_id]]
+        self._matches = (text, matches)
+        return matches
+
+
+class TableView:
+    """Renders the visible window of a TableModel into a ttk.Treeview.
+
+    Only the rows that fit in the widget exist as Treeview items. The
+    scrollbar, mouse wheel and arrow keys move the window over the model's
+    view, and rendering reuses the items that stay in it. Selection is kept
+    by row id, so it survives scrolling, sorting and filtering.
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar, model: TableModel):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.model = model
+        self.first = 0
+        self.visible = int(tree.cget('height'))
+        self.selected = set()
+        self._rendered: Dict[str, tuple] = {}
+        self._refresh_pending = False
+        style = tree.cget('style') or 'Treeview'
+        self.row_height = int(ttk.Style().lookup(style, 'rowheight') or 20)
+
+        scrollbar.configure(command=self.yview)
+        for column in model.columns:
+            tree.heading(column, command=lambda c=column: self.sort_by(c))
+        tree.bind('<Configure>', self._on_configure)
+        tree.bind('<<TreeviewSelect>>', self._on_select)
+        tree.bind('<MouseWheel>', self._on_wheel)
+        tree.bind('<Button-4>', lambda e: self._scroll(-WHEEL_ROWS))
+        tree.bind('<Button-5>', lambda e: self._scroll(WHEEL_ROWS))
+        tree.bind('<Up>', lambda e: self._step(-1))
+        tree.bind('<Down>', lambda e: self._step(1))
+
+    def selection(self) -> List[str]:
+        """Ids of the selected rows that pass the filter, in view order."""
+        return [row_id for row_id in self.model.view() if row_id in self.selected]
+
+    def replace(self, rows: Dict[str, Sequence]):
+        if self.model.replace(rows):
+            self.refresh()
+
+    def add(self, row_id: str, values: Sequence):
+        if self.model.set(row_id, values):
+            self.refresh()
+
+    def update(self, row_id: str, changes: Dict[str, object]):
+        if self.model.update(row_id, changes):
+            self.refresh()
+
+    def remove(self, row_ids: Iterable[str]):
+        if self.model.remove(row_ids):
+            self.refresh()
+
+    def clear(self):
+        self.model.clear()
+        self.first = 0
+        self.refresh()
+
+    def set_filter(self, text: str):
+        if self.model.set_filter(text):
+            self.first = 0
+            self.refresh()
+
+    def sort_by(self, column: str):
+        self.model.sort_by(column)
+        for name in self.model.columns:
+            arrow = ('' if name != self.model.sort_column
+                     else ' ▼' if self.model.sort_descending else ' ▲')
+            self.tree.heading(name, text=name + arrow)
+        self.refresh()
+
+    def refresh(self):
+        """Re-render once the event loop is idle, however many changes came in."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.tree.after_idle(self.render)
+
+    def render(self):
+        self._refresh_pending = False
+        view = self.model.view()
+        self.selected.intersection_update(self.model.rows)
+        self.first = max(0, min(self.first, len(view) - self.visible))
+        # One extra row fills a partly visible last line
+        window = view[self.first:self.first + self.visible + 1]
+
+        wanted = set(window)
+        stale = [item for item in self.tree.get_children() if item not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+            for item in stale:
+                del self._rendered[item]
+        for index, row_id in enumerate(window):
+            values = self.model.rows[row_id]
+            if row_id in self._rendered:
+                if self._rendered[row_id] != values:
+                    self.tree.item(row_id, values=values)
+                self.tree.move(row_id, '', index)
+            else:
+                self.tree.insert('', index, iid=row_id, values=values)
+            self._rendered[row_id] = values
+        self.tree.selection_set([row_id for row_id in window if row_id in self.selected])
+
+        if view:
+            self.scrollbar.set(self.first / len(view), min(1.0, (self.first + self.visible) / len(view)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args):
+        """Scrollbar command: ``moveto fraction`` or ``scroll n units|pages``."""
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.model.view()))
+            self.render()
+        elif args[0] == 'scroll':
+            self._scroll(int(args[1]) * (self.visible if args[2] == 'pages' else 1))
+
+    def _scroll(self, rows: int):
+        self.first += rows
+        self.render()
+        return 'break'
+
+    def _step(self, rows: int):
+        """Move the focus by a row, scrolling the window when it reaches an edge."""
+        items = self.tree.get_children()
+        focus = self.tree.focus()
+        if not items or focus not in items:
+            return None
+        index = items.index(focus) + rows
+        if 0 <= index < min(len(items), self.visible):
+            return None  # The Treeview moves within the window itself
+        view = self.model.view()
+        position = view.index(focus) + rows
+        if not 0 <= position < len(view):
+            return 'break'
+        self.selected = {view[position]}
+        self._scroll(rows)
+        self.tree.focus(view[position])
+        return 'break'
+
+    def _on_wheel(self, event):
+        rows = -event.delta // 120 if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1)
+        return self._scroll(rows * WHEEL_ROWS)
+
+    def _on_configure(self, event):
+        visible = max(1, event.height // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def _on_select(self, event):
+        rendered = set(self.tree.get_children())
+        self.selected = (self.selected - rendered) | set(self.tree.selection())
@@ -0,0 +1,33 @@
+import gc
+import os
+
+# Gunicorn picks this file up automatically from the working directory.
+#
+# With PRELOAD_MODEL=true the app (and the sentence transformer weights) is
+# imported once in the master and shared copy-on-write with the workers.
+# Otherwise each worker imports the app itself and only loads the model the
+# first time it scores a search result.
+preload_app = os.getenv('PRELOAD_MODEL', 'false').lower() == 'true'
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+# Threads per worker (gthread). A check event stream holds its thread for the
+# whole sweep; with the sync worker it would block the worker and be killed
+# once it outlived the timeout.
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far out of the collector's reach, so garbage
+    # collections in the workers do not touch (and copy) the shared pages
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from app import app, db, start_scheduler
+    # Connections opened in the master must not be shared across processes
+    with app.app_context():
+        db.get_engine(app).dispose()
+    start_scheduler()
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional
+from urllib3.util.retry import Retry
+import metrics
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+class ResponseCache:
+    """On-disk cache of GET responses with their validators.
+
+    Each URL is stored as one JSON file named after the hash of the URL and
+    written atomically, so concurrent workers never read a partial entry.
+    Once the cache holds more than ``max_entries`` files, the least recently
+    written tenth is evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries or int(os.getenv('HTTP_CACHE_MAX_ENTRIES', 10000))
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries = len(self._files())
+
+    def _files(self):
+        return [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.json')]
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url: str) -> Optional[Dict]:
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, entry: Dict):
+        path = self._path(url)
+        is_new = not os.path.exists(path)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing HTTP cache entry for {url}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        if is_new:
+            with self._lock:
+                self._entries += 1
+                if self._entries > self.max_entries:
+                    self._evict()
+
+    def _evict(self):
+        """Remove the oldest entries by modification time, leaving room to grow."""
+        files = self._files()
+        keep = self.max_entries - max(1, self.max_entries // 10)
+        if len(files) > keep:
+            files.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in files[:len(files) - keep]:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass  # Already evicted by another worker
+        self._entries = len(self._files())
+
+
+class HttpClient:
+    """Shared HTTP client with pooled keep-alive connections and conditional GETs.
+
+    Connections are reused per host through a single ``requests.Session``,
+    transient failures are retried with exponential backoff, and responses
+    are cached on disk so unchanged pages are revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and come back as 304s.
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, cache_dir: str = None,
+                 pool_maxsize: int = None, retries: int = None, backoff_factor: float = 0.5):
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+
+        retry = Retry(
+            total=retries if retries is not None else int(os.getenv('HTTP_RETRIES', 3)),
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD'])
+        )
+        pool_maxsize = pool_maxsize or int(os.getenv('HTTP_POOL_MAXSIZE', 8))
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        cache_dir = cache_dir or os.getenv('HTTP_CACHE_DIR', '.http_cache')
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+
+    def get_text(self, url: str, timeout: float = 10) -> str:
+        """GET a URL and return its body, serving fresh or revalidated copies from the cache."""
+        cached = self.cache.get(url) if self.cache else None
+        if cached and _is_fresh(cached):
+            metrics.HTTP_CACHE.inc(result='fresh')
+            return cached['body']
+
+        request_headers = {}
+        if cached:
+            if cached.get('etag'):
+                request_headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                request_headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.session.get(url, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and cached:
+            metrics.HTTP_CACHE.inc(result='revalidated')
+            self._store(url, response, cached['body'], previous=cached)
+            return cached['body']
+        if self.cache:
+            metrics.HTTP_CACHE.inc(result='miss')
+
+        response.raise_for_status()
+        self._store(url, response, response.text)
+        return response.text
+
+    def _store(self, url: str, response: requests.Response, body: str, previous: Optional[Dict] = None):
+        if not self.cache:
+            return
+        previous = previous or {}
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if 'no-store' in cache_control or 'private' in cache_control:
+            return
+        # A 304 may omit validators; keep the ones we revalidated with
+        etag = response.headers.get('ETag') or previous.get('etag')
+        last_modified = response.headers.get('Last-Modified') or previous.get('last_modified')
+        match = _MAX_AGE_RE.search(cache_control)
+        max_age = int(match.group(1)) if match and 'no-cache' not in cache_control else 0
+        # Without validators an entry is only useful while it is fresh
+        if not (etag or last_modified or max_age > 0):
+            return
+        self.cache.put(url, {
+            'url': url,
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'max_age': max_age,
+            'stored_at': time.time()
+        })
+
+    def close(self):
+        self.session.close()
+
+
+def _is_fresh(entry: Dict) -> bool:
+    return time.time() - entry['stored_at'] < entry.get('max_age', 0)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client(headers: Optional[Dict[str, str]] = None) -> HttpClient:
+    """Return the process-wide HTTP client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(headers=headers)
+        return _client
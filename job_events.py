@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional
+
+
+class JobEventLog:
+    """In-process log of check job events that stream clients can follow.
+
+    Each job's events are kept in order, so a client that connects after the
+    job started replays what it missed before waiting for new events. Logs of
+    the ``max_jobs`` most recently opened jobs are retained.
+    """
+
+    def __init__(self, max_jobs: int = 8):
+        self.max_jobs = max_jobs
+        # Job id -> (events, closed flag)
+        self._logs: 'OrderedDict[str, list]' = OrderedDict()
+        self._condition = threading.Condition()
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._condition:
+            return job_id in self._logs
+
+    def open(self, job_id: str):
+        """Start a log for a job, dropping the oldest finished logs beyond ``max_jobs``."""
+        with self._condition:
+            self._logs[job_id] = [[], False]
+            for old_id in list(self._logs):
+                if len(self._logs) <= self.max_jobs:
+                    break
+                if self._logs[old_id][1]:
+                    del self._logs[old_id]
+            self._condition.notify_all()
+
+    def publish(self, job_id: str, *events: Dict):
+        with self._condition:
+            log = self._logs.get(job_id)
+            if log is None or log[1]:
+                return
+            log[0].extend(events)
+            self._condition.notify_all()
+
+    def close(self, job_id: str):
+        """Mark a job's log as complete; followers end once they have read it."""
+        with self._condition:
+            if job_id in self._logs:
+                self._logs[job_id][1] = True
+            self._condition.notify_all()
+
+    def follow(self, job_id: str, heartbeat: float = 15.0) -> Iterator[Optional[Dict]]:
+        """Yield a job's events from the start until its log is closed.
+
+        Yields ``None`` whenever no event arrived for ``heartbeat`` seconds,
+        so the caller can keep an idle connection alive.
+        """
+        offset = 0
+        idle_since = time.monotonic()
+        while True:
+            with self._condition:
+                log = self._logs.get(job_id)
+                if log is not None and offset >= len(log[0]) and not log[1]:
+                    self._condition.wait(max(0.0, idle_since + heartbeat - time.monotonic()))
+                    log = self._logs.get(job_id)
+                if log is None:
+                    return
+                events, closed = log[0][offset:], log[1]
+            offset += len(events)
+            if events:
+                yield from events
+                idle_since = time.monotonic()
+            elif closed:
+                return
+            elif time.monotonic() - idle_since >= heartbeat:
+                yield None
+                idle_since = time.monotonic()
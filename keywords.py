@@ -0,0 +1,105 @@
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Pattern
+from embedding_cache import normalize_text
+
+# Up to this many keywords, one substring test per keyword beats the regex
+_SUBSTRING_SCAN_LIMIT = 8
+
+
+def normalize_keyword_text(text: str) -> str:
+    """Normalize text for keyword matching: NFKC, casefolded, whitespace collapsed."""
+    return normalize_text(text).casefold()
+
+
+def _fold(text: str) -> str:
+    """Casefold text for scanning; whitespace runs are left to the pattern."""
+    if text.isascii():
+        # NFKC leaves ASCII unchanged and casefold equals lower for it
+        return text.lower()
+    return unicodedata.normalize('NFKC', text).casefold()
+
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """Build a regex matching any of the terms, shaped like a trie of their characters.
+
+    Shared prefixes are tested once instead of once per term, so the cost of a
+    match attempt grows with the text rather than the number of keywords.
+    Longer terms win over their prefixes.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [
+            (r'\s+' if char == ' ' else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Matches a conference's keywords against text, built once per conference.
+
+    Keywords and text are normalized the same way (NFKC, casefold, collapsed
+    whitespace). Longer keyword lists are compiled into one trie-shaped regex,
+    so each link is scanned once no matter how many keywords there are; short
+    lists use plain substring tests, which are cheaper. Matching is by
+    substring, like ``keyword.lower() in text.lower()``.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(keyword for keyword in keywords if keyword and keyword.strip()))
+        self._by_term: Dict[str, List[str]] = {}
+        for keyword in self.keywords:
+            self._by_term.setdefault(normalize_keyword_text(keyword), []).append(keyword)
+        self._terms = list(self._by_term)
+        self._order = {keyword: index for index, keyword in enumerate(self.keywords)}
+        self._pattern: Optional[Pattern] = None
+        if len(self._terms) > _SUBSTRING_SCAN_LIMIT:
+            # The regex reports the longest term starting at each position; a
+            # hit also implies a hit for every term it contains
+            self._pattern = re.compile(f'(?=({_trie_regex(self._terms)}))')
+            self._contained = {
+                term: [other for other in self._terms if other != term and other in term] for term in self._terms
+            }
+
+    def __bool__(self):
+        return bool(self._terms)
+
+    def hits(self, text: str) -> List[str]:
+        """Return the keywords found in text, in the order they were given."""
+        if not self._terms or not text:
+            return []
+        if self._pattern is None:
+            folded = ' '.join(_fold(text).split())
+            found = {term for term in self._terms if term in folded}
+        else:
+            found = {' '.join(match.split()) for match in self._pattern.findall(_fold(text))}
+            for term in list(found):
+                found.update(self._contained[term])
+        if not found:
+            return []
+        return sorted((keyword for term in found for keyword in self._by_term[term]), key=self._order.get)
+
+    def rank(self, results: List[Dict], fields=('title', 'snippet')) -> List[Dict]:
+        """Record each result's keyword hits and order results by how many keywords they hit.
+
+        Ties keep their original order, so a source's own ranking is preserved
+        among equally relevant results.
+        """
+        for result in results:
+            if 'keyword_hits' not in result:
+                result['keyword_hits'] = self.hits(' '.join(result.get(field) or '' for field in fields))
+        return sorted(results, key=lambda result: -len(result['keyword_hits']))
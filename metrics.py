@@ -0,0 +1,182 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds, the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_registry: List['_Metric'] = []
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter, optionally split by labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def get(self, **labels) -> float:
+        """Return the value for one label set."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values, optionally split by labels."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the ``with`` block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def totals(self) -> Tuple[int, float]:
+        """Return the observation count and sum across all label sets."""
+        with self._lock:
+            return (
+                sum(sum(counts) for counts, _ in self._values.values()),
+                sum(total for _, total in self._values.values())
+            )
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else _format_value(bound)
+                    labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def snapshot() -> Dict[str, Tuple[float, float]]:
+    """Return ``(count, sum)`` per histogram and ``(value, value)`` per counter, summed over labels."""
+    values = {}
+    for metric in _registry:
+        if isinstance(metric, Histogram):
+            values[metric.name] = metric.totals()
+        else:
+            total = metric.total()
+            values[metric.name] = (total, total)
+    return values
+
+
+def delta(before: Dict[str, Tuple[float, float]]) -> Dict[str, Tuple[float, float]]:
+    """Return how much each metric moved since ``before`` was taken with ``snapshot``."""
+    after = snapshot()
+    return {
+        name: (count - before.get(name, (0, 0))[0], total - before.get(name, (0, 0))[1])
+        for name, (count, total) in after.items()
+    }
+
+
+# Metrics are per process; with several gunicorn workers each worker reports its own.
+FETCH_SECONDS = Histogram('confseeker_fetch_seconds', 'Time to fetch a source page.', ['host'])
+FETCH_ERRORS = Counter('confseeker_fetch_errors_total', 'Source pages that could not be fetched.', ['host'])
+HTTP_CACHE = Counter('confseeker_http_cache_total', 'Source page cache lookups by outcome.', ['result'])
+PARSE_SECONDS = Histogram('confseeker_parse_seconds', 'Time to parse a source page.', ['source'])
+PARSE_ERRORS = Counter('confseeker_parse_errors_total', 'Source pages that could not be parsed.')
+ENCODE_BATCH_SIZE = Histogram('confseeker_encode_batch_size', 'Texts per model encode call.',
+                              buckets=SIZE_BUCKETS)
+ENCODE_SECONDS = Histogram('confseeker_encode_seconds', 'Time of a model encode call.')
+EMBEDDING_CACHE = Counter('confseeker_embedding_cache_total', 'Embedding cache lookups by outcome.', ['result'])
+DB_COMMIT_SECONDS = Histogram('confseeker_db_commit_seconds', 'Time of a database commit.')
+NOTIFICATION_SECONDS = Histogram('confseeker_notification_send_seconds', 'Time to send a notification.',
+                                 ['channel'])
+NOTIFICATION_ERRORS = Counter('confseeker_notification_errors_total', 'Notifications that could not be sent.',
+                              ['channel'])
+MATCHES = Counter('confseeker_matches_total', 'Search results that scored above the similarity threshold.')
+CONFERENCES_CHECKED = Counter('confseeker_conferences_checked_total', 'Conferences checked.')
+PREFILTER = Counter('confseeker_prefilter_total', 'Search results kept or pruned before scoring, by outcome.',
+                    ['result'])
+SEARCH_INDEX_SECONDS = Histogram('confseeker_search_index_seconds', 'Time of a conference search index lookup.')
@@ -0,0 +1,191 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import metrics
+import resources
+
+
+def _retry(func: Callable, *args, attempts: int = 3, backoff: float = 1.0):
+    """Call func, retrying with exponential backoff; re-raise the last error."""
+    for attempt in range(attempts):
+        try:
+            return func(*args)
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            delay = backoff * 2 ** attempt
+            print(f"Notification send failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+class NotificationError(Exception):
+    """Raised when a digest could not be delivered on every channel."""
+
+
+class AzureTransport:
+    """Delivers notifications through Azure Communication Services and Service Bus."""
+
+    def __init__(self, attempts: int = 3, backoff: float = 1.0):
+        self.attempts = attempts
+        self.backoff = backoff
+
+    def send_email(self, message: Dict):
+        poller = resources.get_email_client().begin_send(message)
+        poller.result()
+
+    def send_messages(self, payloads: List[str]):
+        """Publish payloads in as few ServiceBusMessageBatch batches as fit, retrying each batch."""
+        from azure.servicebus import ServiceBusMessage
+
+        sender = resources.get_notification_queue()
+        batch = sender.create_message_batch()
+        for payload in payloads:
+            message = ServiceBusMessage(payload, content_type="application/json")
+            try:
+                batch.add_message(message)
+            except ValueError:
+                # Batch is full (MessageSizeExceededError): send it and start a new one
+                _retry(sender.send_messages, batch, attempts=self.attempts, backoff=self.backoff)
+                batch = sender.create_message_batch()
+                batch.add_message(message)
+        if len(batch):
+            _retry(sender.send_messages, batch, attempts=self.attempts, backoff=self.backoff)
+
+
+class InMemoryTransport:
+    """Transport that records notifications instead of sending them, for tests and benchmarks."""
+
+    def __init__(self):
+        self.emails = []
+        self.messages = []
+
+    def send_email(self, message: Dict):
+        self.emails.append(message)
+
+    def send_messages(self, payloads: List[str]):
+        self.messages.extend(json.loads(payload) for payload in payloads)
+
+
+class NotificationDispatcher:
+    """Collects matches during a sweep and sends them as digests.
+
+    Matches are grouped per conference and sent as one digest email per
+    recipient plus batched Service Bus messages. Sends run on a background
+    thread so the sweep is never blocked on Azure, and each send is retried
+    with exponential backoff.
+    """
+
+    def __init__(self, transport=None, recipients: Optional[List[str]] = None,
+                 sender_address: Optional[str] = None, attempts: int = 3, backoff: float = 1.0):
+        self.transport = transport or AzureTransport(attempts=attempts, backoff=backoff)
+        if recipients is None:
+            recipients = [
+                address.strip() for address in os.getenv('NOTIFICATION_EMAIL', '').split(',')
+                if address.strip()
+            ]
+        self.recipients = recipients
+        self.sender_address = sender_address or os.getenv('AZURE_COMMUNICATION_SENDER_EMAIL')
+        self.attempts = attempts
+        self.backoff = backoff
+        self._matches = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notify')
+
+    def add(self, conference_name: str, conference_year: int, match: Dict, similarity: float):
+        """Record a match to be sent with the next flush."""
+        self._matches.setdefault((conference_name, conference_year), []).append({
+            'title': match['title'],
+            'source': match['source'],
+            'link': match['link'],
+            'similarity': similarity
+        })
+
+    def __len__(self):
+        return sum(len(matches) for matches in self._matches.values())
+
+    def flush(self) -> Future:
+        """Send all collected matches in the background and clear them.
+
+        The returned future resolves once every digest and batch has been
+        delivered, or fails with NotificationError once any of them was given
+        up on, so callers only record matches as notified after delivery.
+        """
+        matches, self._matches = self._matches, OrderedDict()
+        if not matches:
+            future = Future()
+            future.set_result(None)
+            return future
+        return self._executor.submit(self._send, matches)
+
+    def close(self):
+        """Wait for pending sends and stop the background thread."""
+        self._executor.shutdown(wait=True)
+
+    def _send(self, matches: Dict):
+        timestamp = datetime.now().isoformat()
+        payloads = [
+            json.dumps({
+                "type": "conference_match",
+                "conference_name": name,
+                "conference_year": year,
+                "match_title": match['title'],
+                "source": match['source'],
+                "link": match['link'],
+                "similarity_score": match['similarity'],
+                "timestamp": timestamp
+            })
+            for (name, year), conference_matches in matches.items()
+            for match in conference_matches
+        ]
+
+        failed = []
+        subject, body = self._format_digest(matches)
+        for recipient in self.recipients:
+            message = {
+                "content": {
+                    "subject": subject,
+                    "plainText": body,
+                    "html": body.replace('\n', '<br>')
+                },
+                "recipients": {
+                    "to": [{"address": recipient}]
+                },
+                "senderAddress": self.sender_address
+            }
+            try:
+                with metrics.NOTIFICATION_SECONDS.time(channel='email'):
+                    _retry(self.transport.send_email, message, attempts=self.attempts, backoff=self.backoff)
+                print(f"Digest email sent to {recipient}")
+            except Exception as e:
+                metrics.NOTIFICATION_ERRORS.inc(channel='email')
+                print(f"Error sending digest email to {recipient}: {e}")
+                failed.append(f"email to {recipient}")
+
+        try:
+            with metrics.NOTIFICATION_SECONDS.time(channel='servicebus'):
+                self.transport.send_messages(payloads)
+            print(f"Service Bus notifications sent for {len(payloads)} matches")
+        except Exception as e:
+            metrics.NOTIFICATION_ERRORS.inc(channel='servicebus')
+            print(f"Error sending Service Bus notifications: {e}")
+            failed.append("Service Bus")
+        if failed:
+            raise NotificationError(f"Digest not delivered: {', '.join(failed)}")
+
+    def _format_digest(self, matches: Dict):
+        total = sum(len(conference_matches) for conference_matches in matches.values())
+        subject = f"Potential Conference Matches: {total} for {len(matches)} conference(s)"
+        lines = ["Potential matches have been found for the conferences you're tracking:", ""]
+        for (name, year), conference_matches in matches.items():
+            lines.append(f"Original Conference: {name} ({year})")
+            for match in conference_matches:
+                lines.append(f"  Found Match: {match['title']}")
+                lines.append(f"  Source: {match['source']}")
+                lines.append(f"  Link: {match['link']}")
+                lines.append(f"  Similarity Score: {match['similarity']:.2f}")
+                lines.append("")
+        return subject, '\n'.join(lines)
@@ -0,0 +1,116 @@
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional
+from urllib.parse import urlsplit
+from keywords import normalize_keyword_text
+import metrics
+
+# Links that are site chrome rather than conference pages
+_JUNK_PATH = re.compile(
+    r'/(?:login|logout|signin|sign-in|signup|sign-up|account|settings|preferences|privacy|terms|cookies?|help|faq'
+    r'|feedback|contact|rss|search)(?:[/.?]|$)'
+    r'|/cfp/(?:call|allcfp|home)\b'
+)
+_MIN_TITLE_CHARS = 4
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() == 'true'
+
+
+def char_ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+    """Return the set of character n-grams of normalized text, padded at word edges."""
+    padded = f" {normalize_keyword_text(text)} "
+    return frozenset(padded[index:index + n] for index in range(len(padded) - n + 1))
+
+
+def ngram_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Cosine similarity of two n-gram sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / math.sqrt(len(a) * len(b))
+
+
+class LexicalPrefilter:
+    """Cheap first stage that drops search results before transformer scoring.
+
+    A result is pruned when its link looks like site chrome (login pages,
+    category listings, non-HTTP links) or its title is too short, or when the
+    character trigram similarity between its title and the conference's name
+    and keywords is below ``min_similarity``. Results mentioning the next
+    edition's year are always kept. With ``require_next_year`` only such
+    results survive.
+
+    Counts per outcome are exported as ``confseeker_prefilter_total`` and can
+    be collected per sweep by passing a ``collections.Counter`` to ``filter``.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, min_similarity: Optional[float] = None,
+                 require_next_year: Optional[bool] = None, url_heuristics: Optional[bool] = None):
+        self.enabled = enabled if enabled is not None else _env_flag('PREFILTER_ENABLED', True)
+        self.min_similarity = (min_similarity if min_similarity is not None
+                               else float(os.getenv('PREFILTER_MIN_SIMILARITY', 0.1)))
+        self.require_next_year = (require_next_year if require_next_year is not None
+                                  else _env_flag('PREFILTER_REQUIRE_NEXT_YEAR', False))
+        self.url_heuristics = (url_heuristics if url_heuristics is not None
+                               else _env_flag('PREFILTER_URL_HEURISTICS', True))
+
+    def _is_junk_link(self, result: Dict) -> bool:
+        link = result.get('link') or ''
+        parts = urlsplit(link)
+        if parts.scheme and parts.scheme not in ('http', 'https'):
+            return True
+        if not parts.netloc and not parts.path:
+            return True
+        return bool(_JUNK_PATH.search(parts.path.lower() + ('?' + parts.query if parts.query else '')))
+
+    def classify(self, conference: Dict, result: Dict, reference: FrozenSet[str] = None) -> str:
+        """Return ``kept`` or the reason the result is pruned (``url``, ``title``, ``year`` or ``lexical``)."""
+        title = (result.get('title') or '').strip()
+        if self.url_heuristics and self._is_junk_link(result):
+            return 'url'
+        if len(title) < _MIN_TITLE_CHARS:
+            return 'title'
+
+        next_year = str(conference['year'] + 1)
+        mentions_next_year = any(next_year in (result.get(field) or '') for field in ('title', 'link', 'snippet'))
+        if mentions_next_year:
+            return 'kept'
+        if self.require_next_year:
+            return 'year'
+
+        if reference is None:
+            reference = self.reference_ngrams(conference)
+        if ngram_similarity(reference, char_ngrams(title)) < self.min_similarity:
+            return 'lexical'
+        return 'kept'
+
+    def reference_ngrams(self, conference: Dict) -> FrozenSet[str]:
+        """N-grams of the text results are compared against: the name plus the keywords."""
+        return char_ngrams(' '.join([conference['name'], *conference.get('keywords', [])]))
+
+    def filter(self, conference: Dict, results: List[Dict], stats: Optional[Counter] = None) -> List[Dict]:
+        """Return the results worth scoring for a conference, counting outcomes into ``stats``."""
+        if not self.enabled or not results:
+            if stats is not None:
+                stats['kept'] += len(results)
+            return results
+        reference = self.reference_ngrams(conference)
+        kept = []
+        for result in results:
+            outcome = self.classify(conference, result, reference)
+            metrics.PREFILTER.inc(result=outcome)
+            if stats is not None:
+                stats[outcome] += 1
+            if outcome == 'kept':
+                kept.append(result)
+        return kept
+
+
+def describe(stats: Counter) -> str:
+    """Summarize prefilter counts, e.g. ``kept 40 of 120 (url 30, lexical 50)``."""
+    total = sum(stats.values())
+    pruned = ', '.join(f"{reason} {count}" for reason, count in sorted(stats.items()) if reason != 'kept' and count)
+    return f"kept {stats['kept']} of {total}" + (f" ({pruned})" if pruned else '')
@@ -0,0 +1,77 @@
+import os
+import threading
+
+from embedding_cache import EmbeddingCache
+from scoring import BatchScorer
+
+# Heavy dependencies (torch via sentence_transformers, the Azure SDKs) are only
+# imported the first time a resource is requested, so processes that never
+# score or notify, such as CRUD-only API workers, never load them.
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+_lock = threading.RLock()
+_model = None
+_scorer = None
+_servicebus_client = None
+_notification_queue = None
+_email_client = None
+
+
+def get_model():
+    """Return the process-wide sentence transformer, loading it on first use."""
+    global _model
+    with _lock:
+        if _model is None:
+            from sentence_transformers import SentenceTransformer
+            _model = SentenceTransformer(os.getenv('MODEL_NAME', MODEL_NAME))
+        return _model
+
+
+def get_scorer() -> BatchScorer:
+    """Return the process-wide batch scorer backed by the embedding cache."""
+    global _scorer
+    with _lock:
+        if _scorer is None:
+            _scorer = BatchScorer(get_model(), model_name=os.getenv('MODEL_NAME', MODEL_NAME), cache=EmbeddingCache())
+        return _scorer
+
+
+def get_servicebus_client():
+    """Return the process-wide Azure Service Bus client."""
+    global _servicebus_client
+    with _lock:
+        if _servicebus_client is None:
+            from azure.servicebus import ServiceBusClient
+            _servicebus_client = ServiceBusClient.from_connection_string(
+                os.getenv('AZURE_SERVICEBUS_CONNECTION_STRING')
+            )
+        return _servicebus_client
+
+
+def get_notification_queue():
+    """Return the process-wide sender for the notification queue."""
+    global _notification_queue
+    with _lock:
+        if _notification_queue is None:
+            _notification_queue = get_servicebus_client().get_queue_sender(
+                queue_name=os.getenv('AZURE_SERVICEBUS_QUEUE_NAME')
+            )
+        return _notification_queue
+
+
+def get_email_client():
+    """Return the process-wide Azure Communication Services email client."""
+    global _email_client
+    with _lock:
+        if _email_client is None:
+            from azure.communication.email import EmailClient
+            _email_client = EmailClient.from_connection_string(
+                os.getenv('AZURE_COMMUNICATION_CONNECTION_STRING')
+            )
+        return _email_client
+
+
+def preload():
+    """Load the model weights up front, e.g. in the gunicorn master before forking workers."""
+    get_model()
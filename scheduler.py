@@ -0,0 +1,114 @@
+import heapq
+import itertools
+import math
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+
+def _parse_last_checked(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def mentions_next_edition(year: int, result: Dict) -> bool:
+    """Return whether a search result refers to the edition after ``year``."""
+    next_year = str(year + 1)
+    return next_year in result.get('title', '') or next_year in (result.get('link') or '')
+
+
+class StalenessScheduler:
+    """Priority scheduler that spreads conference checks evenly over time.
+
+    Conferences sit in a heap ordered by their next due time, derived from
+    ``last_checked`` and how likely a new edition is to appear:
+
+    - conferences whose next edition has already been found, or whose year is
+      outside the announcement window (the conference year and the year after),
+      back off to ``base_interval * backoff_factor``
+    - everything else is re-checked every ``base_interval``
+
+    Each tick only pops a bounded slice of due conferences, so the load of a
+    full sweep is spread over the week instead of arriving at once.
+    """
+
+    def __init__(self, base_interval: timedelta = None, backoff_factor: int = None, tick_interval: timedelta = None,
+                 key: Callable[[Dict], Hashable] = id):
+        self.base_interval = base_interval or timedelta(days=float(os.getenv('SCHEDULER_BASE_INTERVAL_DAYS', 7)))
+        self.backoff_factor = backoff_factor or int(os.getenv('SCHEDULER_BACKOFF_FACTOR', 4))
+        self.tick_interval = tick_interval or timedelta(minutes=float(os.getenv('SCHEDULER_TICK_MINUTES', 60)))
+        self.key = key
+        self._heap = []
+        self._entries = {}
+        self._counter = itertools.count()
+
+    def interval_for(self, conference: Dict, reference: datetime) -> timedelta:
+        """Return how long to wait between checks of a conference."""
+        if conference.get('next_edition_found'):
+            return self.base_interval * self.backoff_factor
+
+        # The next edition is announced during the conference year or the year after
+        if not conference['year'] <= reference.year <= conference['year'] + 1:
+            return self.base_interval * self.backoff_factor
+        return self.base_interval
+
+    def next_due(self, conference: Dict) -> datetime:
+        """Return when a conference is next due; never-checked conferences are due immediately."""
+        last_checked = _parse_last_checked(conference.get('last_checked'))
+        if last_checked is None:
+            return datetime.min
+        return last_checked + self.interval_for(conference, last_checked)
+
+    def push(self, conference: Dict):
+        """Add a conference to the schedule or move it to its new due time."""
+        key = self.key(conference)
+        entry = [self.next_due(conference), next(self._counter), key, conference]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def load(self, conferences: Iterable[Dict]):
+        """Replace the schedule with the given conferences."""
+        self._heap = []
+        self._entries = {}
+        for conference in conferences:
+            self.push(conference)
+
+    def remove(self, conference: Dict):
+        self._entries.pop(self.key(conference), None)
+
+    def slice_size(self) -> int:
+        """Return how many conferences a tick should process to cover all of them once per base interval."""
+        configured = os.getenv('SCHEDULER_SLICE_SIZE')
+        if configured:
+            return int(configured)
+        ticks_per_interval = max(1.0, self.base_interval / self.tick_interval)
+        return max(1, math.ceil(len(self._entries) / ticks_per_interval))
+
+    def pop_due(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Pop up to ``limit`` conferences whose due time has passed, most overdue first.
+
+        Popped conferences leave the schedule until they are pushed back after
+        being checked.
+        """
+        now = now or datetime.now()
+        limit = limit if limit is not None else self.slice_size()
+        due = []
+        while self._heap and len(due) < limit:
+            entry = self._heap[0]
+            if self._entries.get(entry[2]) is not entry:
+                # Superseded by a later push or removed
+                heapq.heappop(self._heap)
+                continue
+            if entry[0] > now:
+                break
+            heapq.heappop(self._heap)
+            del self._entries[entry[2]]
+            due.append(entry[3])
+        return due
+
+    def __len__(self):
+        return len(self._entries)
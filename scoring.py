@@ -0,0 +1,93 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from embedding_cache import EmbeddingCache, normalize_text
+from similarity import cosine_matrix, normalize, paired_cosine
+import metrics
+
+
+class BatchScorer:
+    """Score search results against conference names with batched embeddings.
+
+    Every distinct conference name and result title of a run is encoded exactly
+    once, and all cosine similarities are computed with NumPy on normalized
+    vectors instead of one transformer forward pass per pair. With an
+    ``EmbeddingCache`` only texts missing from the cache reach the model.
+    """
+
+    def __init__(self, model, model_name: str = 'all-MiniLM-L6-v2',
+                 cache: Optional[EmbeddingCache] = None, batch_size: int = 64):
+        self.model = model
+        self.model_name = model_name
+        self.cache = cache
+        self.batch_size = batch_size
+
+    def _encode_normalized(self, texts: List[str]) -> np.ndarray:
+        """Run the model on texts in a single batch and L2-normalize the rows."""
+        metrics.ENCODE_BATCH_SIZE.observe(len(texts))
+        with metrics.ENCODE_SECONDS.time():
+            return normalize(self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True))
+
+    def encode(self, texts: Sequence[str], use_cache: bool = True) -> np.ndarray:
+        """Return normalized embeddings for texts, using the cache when configured.
+
+        One-off texts such as search queries pass ``use_cache=False`` so they
+        do not fill the persistent cache.
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        if self.cache is None or not use_cache:
+            return self._encode_normalized(list(texts))
+
+        keys = [normalize_text(text) for text in texts]
+        vectors = self.cache.get_many(self.model_name, keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing:
+            computed = dict(zip(missing, self._encode_normalized(missing)))
+            self.cache.put_many(self.model_name, computed)
+            vectors.update(computed)
+        return np.stack([vectors[key] for key in keys])
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return embedding cache hit/miss counters, or zeros without a cache."""
+        if self.cache is None:
+            return {'hits': 0, 'misses': 0}
+        return self.cache.stats()
+
+    def similarity_matrix(self, texts1: Sequence[str], texts2: Sequence[str]) -> np.ndarray:
+        """Return the cosine similarity of every text in texts1 against every text in texts2."""
+        return cosine_matrix(self.encode(texts1), self.encode(texts2), normalized=True)
+
+    def score_pairs(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        """Return the cosine similarity of each (text1, text2) pair."""
+        if not pairs:
+            return []
+        left_index: Dict[str, int] = {}
+        right_index: Dict[str, int] = {}
+        for left, right in pairs:
+            left_index.setdefault(left, len(left_index))
+            right_index.setdefault(right, len(right_index))
+
+        left_embeddings = self.encode(list(left_index))
+        right_embeddings = self.encode(list(right_index))
+
+        rows = np.fromiter((left_index[left] for left, _ in pairs), dtype=np.intp, count=len(pairs))
+        cols = np.fromiter((right_index[right] for _, right in pairs), dtype=np.intp, count=len(pairs))
+        scores = paired_cosine(left_embeddings[rows], right_embeddings[cols], normalized=True)
+        return [float(score) for score in scores]
+
+    def score_results(self, batches: Sequence[Tuple[str, List[Dict]]]) -> List[List[float]]:
+        """Score search results for many conferences at once.
+
+        ``batches`` holds one ``(conference_name, results)`` entry per conference;
+        the return value holds the similarity of each result title to its
+        conference name, in the same order.
+        """
+        pairs = [(name, result['title']) for name, results in batches for result in results]
+        flat_scores = self.score_pairs(pairs)
+
+        scores = []
+        offset = 0
+        for _, results in batches:
+            scores.append(flat_scores[offset:offset + len(results)])
+            offset += len(results)
+        return scores
@@ -0,0 +1,355 @@
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+import numpy as np
+from numpy.lib.format import open_memmap
+from similarity import normalize
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, run a single writer
+    fcntl = None
+
+# Normalized vector components lie in [-1, 1]; int8 rows store them scaled by this
+_INT8_SCALE = 127.0
+_MIN_CAPACITY = 1024
+# Rows copied, assigned or widened from int8 per block
+_BLOCK_ROWS = 8192
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() == 'true'
+
+
+def train_centroids(vectors: np.ndarray, lists: int, iterations: int = 10, sample_size: int = 64,
+                    seed: int = 0) -> np.ndarray:
+    """Cluster normalized vectors into ``lists`` unit centroids with spherical k-means.
+
+    Trains on at most ``sample_size`` vectors per list.
+    """
+    rng = np.random.default_rng(seed)
+    if len(vectors) > lists * sample_size:
+        vectors = vectors[np.sort(rng.choice(len(vectors), lists * sample_size, replace=False))]
+    vectors = np.asarray(vectors, dtype=np.float32)
+    centroids = vectors[rng.choice(len(vectors), lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        empty = ~sums.any(axis=1)
+        # Reseed empty lists with random vectors
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize(sums)
+    return centroids
+
+
+class _Generation:
+    """One on-disk version of the index: memory-mapped arrays sharing a slot layout.
+
+    Slot ``i`` holds the vector of conference ``ids[i]`` (``-1`` for a free
+    slot), the digest of the text it was computed from and, with IVF, the
+    list it belongs to.
+    """
+
+    def __init__(self, path: str, key):
+        self.path = path
+        self.key = key
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r+')
+        self.ids = np.load(os.path.join(path, 'ids.npy'), mmap_mode='r+')
+        self.digests = np.load(os.path.join(path, 'digests.npy'), mmap_mode='r+')
+        self.lists = np.load(os.path.join(path, 'lists.npy'), mmap_mode='r+')
+        centroids_path = os.path.join(path, 'centroids.npy')
+        self.centroids = np.load(centroids_path) if os.path.exists(centroids_path) else None
+
+    @staticmethod
+    def create(path: str, capacity: int, dim: int, meta: dict, centroids: Optional[np.ndarray]):
+        os.makedirs(path)
+        dtype = np.int8 if meta['dtype'] == 'int8' else np.float32
+        open_memmap(os.path.join(path, 'vectors.npy'), mode='w+', dtype=dtype, shape=(capacity, dim)).flush()
+        ids = open_memmap(os.path.join(path, 'ids.npy'), mode='w+', dtype=np.int64, shape=(capacity,))
+        ids[:] = -1
+        ids.flush()
+        open_memmap(os.path.join(path, 'digests.npy'), mode='w+', dtype=np.uint32, shape=(capacity,)).flush()
+        lists = open_memmap(os.path.join(path, 'lists.npy'), mode='w+', dtype=np.int32, shape=(capacity,))
+        lists[:] = -1
+        lists.flush()
+        if centroids is not None:
+            np.save(os.path.join(path, 'centroids.npy'), centroids)
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    def flush(self):
+        for array in (self.vectors, self.digests, self.lists, self.ids):
+            array.flush()
+
+    def dense(self, slots) -> np.ndarray:
+        """Return the float32 vectors of the given slots."""
+        vectors = self.vectors[slots]
+        if vectors.dtype == np.int8:
+            return vectors.astype(np.float32) / _INT8_SCALE
+        return vectors
+
+
+class SearchIndex:
+    """Persisted embedding matrix of conferences for nearest-neighbour search.
+
+    Vectors are L2-normalized, so a query is one matrix-vector product over
+    the stored rows followed by a partial sort for the top k. The arrays are
+    ``.npy`` files opened as shared memory maps, so every worker process
+    searches the same index and sees rows written by the others; writers
+    serialize on a lock file. Updates overwrite single rows in place, and
+    the files are only rewritten when they run out of free slots.
+
+    ``quantize`` stores rows as int8, a quarter of the float32 size. With
+    ``ivf_lists`` set, rows are also partitioned into that many clusters
+    once the index holds ``ivf_min_rows`` rows, and a query only scores the
+    rows of its ``probes`` nearest clusters.
+    """
+
+    def __init__(self, path: Optional[str] = None, model_name: Optional[str] = None,
+                 quantize: Optional[bool] = None, ivf_lists: Optional[int] = None,
+                 ivf_min_rows: Optional[int] = None, probes: Optional[int] = None):
+        self.path = path or os.getenv('SEARCH_INDEX_DIR', 'search_index')
+        self.model_name = model_name or os.getenv('MODEL_NAME', 'all-MiniLM-L6-v2')
+        self.quantize = quantize if quantize is not None else _env_flag('SEARCH_INDEX_QUANTIZE', False)
+        self.ivf_lists = ivf_lists if ivf_lists is not None else int(os.getenv('SEARCH_INDEX_IVF_LISTS', 0))
+        self.ivf_min_rows = (ivf_min_rows if ivf_min_rows is not None
+                             else int(os.getenv('SEARCH_INDEX_IVF_MIN_ROWS', 50000)))
+        self.probes = probes if probes is not None else int(os.getenv('SEARCH_INDEX_IVF_PROBES', 8))
+        self._lock = threading.RLock()
+        self._generation: Optional[_Generation] = None
+
+    @property
+    def _dtype(self) -> str:
+        return 'int8' if self.quantize else 'float32'
+
+    def _current(self) -> Optional[_Generation]:
+        """Return the current generation, reopening it if another process replaced it."""
+        marker = os.path.join(self.path, 'CURRENT')
+        for _ in range(3):
+            try:
+                stat = os.stat(marker)
+                key = (stat.st_ino, stat.st_mtime_ns)
+                if self._generation is None or self._generation.key != key:
+                    with open(marker) as f:
+                        name = f.read().strip()
+                    self._generation = _Generation(os.path.join(self.path, name), key)
+                return self._generation
+            except FileNotFoundError:
+                if not os.path.exists(marker):
+                    self._generation = None
+                    return None
+                # Replaced by another process while opening it; read the marker again
+        raise RuntimeError(f"Could not open search index at {self.path}")
+
+    def _compatible(self, generation: Optional[_Generation]) -> bool:
+        return (generation is not None and generation.meta['model'] == self.model_name
+                and generation.meta['dtype'] == self._dtype)
+
+    @contextmanager
+    def _writing(self):
+        """Hold the thread lock and the lock file while changing the index."""
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            with open(os.path.join(self.path, 'lock'), 'a+') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        with self._lock:
+            generation = self._current()
+            if not self._compatible(generation):
+                return 0
+            return int(np.count_nonzero(generation.ids >= 0))
+
+    def stale(self, ids: np.ndarray, digests: np.ndarray) -> np.ndarray:
+        """Return a mask of the ids that are missing or were indexed from different text."""
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            generation = self._current()
+            if not self._compatible(generation):
+                return np.ones(len(ids), dtype=bool)
+            slots = self._slots(generation, ids)
+            stale = slots < 0
+            present = ~stale
+            stale[present] = generation.digests[slots[present]] != np.asarray(digests, dtype=np.uint32)[present]
+            return stale
+
+    @staticmethod
+    def _slots(generation: _Generation, ids: np.ndarray) -> np.ndarray:
+        """Return the slot holding each id, or -1."""
+        occupied = np.flatnonzero(generation.ids >= 0)
+        occupied_ids = generation.ids[occupied]
+        order = np.argsort(occupied_ids)
+        positions = np.searchsorted(occupied_ids, ids, sorter=order)
+        positions = np.minimum(positions, max(len(order) - 1, 0))
+        slots = np.full(len(ids), -1, dtype=np.int64)
+        if len(order):
+            found = occupied_ids[order[positions]] == ids
+            slots[found] = occupied[order[positions[found]]]
+        return slots
+
+    def _rewrite(self, generation: Optional[_Generation], capacity: int, dim: int,
+                 centroids: Optional[np.ndarray] = None) -> _Generation:
+        """Copy the live rows into a new generation of at least ``capacity`` slots and switch to it.
+
+        Rows are carried over only from a compatible generation of the same
+        dimension. Must be called while writing.
+        """
+        carry = self._compatible(generation) and generation.meta['dim'] == dim
+        keep = np.flatnonzero(generation.ids >= 0) if carry else np.zeros(0, dtype=np.int64)
+        if centroids is None and carry:
+            centroids = generation.centroids
+        capacity = max(capacity, len(keep), _MIN_CAPACITY)
+        name = f"gen-{time.time_ns()}"
+        meta = {'model': self.model_name, 'dtype': self._dtype, 'dim': dim}
+        _Generation.create(os.path.join(self.path, name), capacity, dim, meta, centroids)
+
+        new = _Generation(os.path.join(self.path, name), None)
+        for start in range(0, len(keep), _BLOCK_ROWS):
+            slots = keep[start:start + _BLOCK_ROWS]
+            rows = slice(start, start + len(slots))
+            new.vectors[rows] = generation.vectors[slots]
+            new.digests[rows] = generation.digests[slots]
+            new.ids[rows] = generation.ids[slots]
+            if centroids is not None:
+                new.lists[rows] = self._assign(centroids, generation.dense(slots))
+        new.flush()
+
+        marker = os.path.join(self.path, 'CURRENT')
+        with open(marker + '.tmp', 'w') as f:
+            f.write(name)
+        os.replace(marker + '.tmp', marker)
+        if generation is not None:
+            # Processes that still map the old files keep them until they reopen
+            shutil.rmtree(generation.path, ignore_errors=True)
+        self._generation = None
+        return self._current()
+
+    @staticmethod
+    def _assign(centroids: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ centroids.T, axis=1).astype(np.int32)
+
+    def upsert(self, ids: np.ndarray, digests: np.ndarray, vectors: np.ndarray):
+        """Store the normalized vectors of conferences, replacing their previous rows."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(ids):
+            return
+        vectors = normalize(vectors)
+        with self._writing():
+            generation = self._current()
+            if not self._compatible(generation) or generation.meta['dim'] != vectors.shape[1]:
+                generation = self._rewrite(generation, len(ids), vectors.shape[1])
+            slots = self._slots(generation, ids)
+            new = slots < 0
+            free = np.flatnonzero(generation.ids < 0)
+            if new.sum() > len(free):
+                generation = self._rewrite(generation, 2 * (len(generation.ids) + int(new.sum())),
+                                           vectors.shape[1])
+                slots = self._slots(generation, ids)
+                new = slots < 0
+                free = np.flatnonzero(generation.ids < 0)
+            slots[new] = free[:int(new.sum())]
+
+            if self.quantize:
+                generation.vectors[slots] = np.round(vectors * _INT8_SCALE).astype(np.int8)
+            else:
+                generation.vectors[slots] = vectors
+            generation.digests[slots] = digests
+            if generation.centroids is not None:
+                generation.lists[slots] = self._assign(generation.centroids, vectors)
+            # Ids last, so a concurrent search never sees an id without its vector
+            generation.ids[slots] = ids
+            generation.flush()
+            self._maybe_train(generation)
+
+    def remove(self, ids) -> int:
+        """Drop conferences from the index; returns how many rows were removed."""
+        ids = np.asarray(list(ids), dtype=np.int64)
+        with self._writing():
+            generation = self._current()
+            if not self._compatible(generation) or not len(ids):
+                return 0
+            slots = self._slots(generation, ids)
+            slots = slots[slots >= 0]
+            generation.ids[slots] = -1
+            generation.flush()
+            return len(slots)
+
+    def retain(self, ids) -> int:
+        """Drop every conference not in ``ids``; returns how many rows were removed."""
+        with self._lock:
+            generation = self._current()
+            if not self._compatible(generation):
+                return 0
+            indexed = generation.ids[generation.ids >= 0]
+            return self.remove(indexed[~np.isin(indexed, np.asarray(list(ids), dtype=np.int64))])
+
+    def _maybe_train(self, generation: _Generation):
+        """Partition the index into IVF lists once it is large enough. Must be called while writing."""
+        if not self.ivf_lists or generation.centroids is not None:
+            return
+        slots = np.flatnonzero(generation.ids >= 0)
+        if len(slots) < max(self.ivf_min_rows, self.ivf_lists):
+            return
+        self._train(generation, self.ivf_lists)
+
+    def _train(self, generation: _Generation, lists: int):
+        slots = np.flatnonzero(generation.ids >= 0)
+        if len(slots) < lists:
+            return
+        centroids = train_centroids(generation.dense(slots), lists)
+        self._rewrite(generation, len(generation.ids), generation.meta['dim'], centroids)
+
+    def train(self, lists: Optional[int] = None):
+        """(Re)build the IVF partitioning from the rows currently in the index."""
+        with self._writing():
+            generation = self._current()
+            if self._compatible(generation):
+                self._train(generation, lists or self.ivf_lists)
+
+    @staticmethod
+    def _score_all(generation: _Generation, query: np.ndarray) -> np.ndarray:
+        """Score every slot; int8 rows are widened a block at a time so the copy stays in cache."""
+        if generation.vectors.dtype != np.int8:
+            return generation.vectors @ query
+        scores = np.empty(len(generation.vectors), dtype=np.float32)
+        for start in range(0, len(scores), _BLOCK_ROWS):
+            block = generation.vectors[start:start + _BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        return scores / _INT8_SCALE
+
+    def search(self, vector: np.ndarray, k: int = 10) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(conference id, cosine similarity)`` pairs, best first."""
+        with metrics.SEARCH_INDEX_SECONDS.time():
+            with self._lock:
+                generation = self._current()
+            if not self._compatible(generation) or k <= 0:
+                return []
+            query = normalize(vector)
+            if generation.centroids is not None and self.probes < len(generation.centroids):
+                probed = np.argpartition(-(generation.centroids @ query), self.probes)[:self.probes]
+                slots = np.flatnonzero(np.isin(generation.lists, probed) & (generation.ids >= 0))
+                scores = generation.dense(slots) @ query
+            else:
+                # Score every slot in one pass, then drop the free ones
+                slots = np.flatnonzero(generation.ids >= 0)
+                scores = self._score_all(generation, query)[slots]
+            if not len(slots):
+                return []
+            k = min(k, len(slots))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(int(generation.ids[slots[index]]), float(scores[index])) for index in top]
@@ -0,0 +1,30 @@
+import numpy as np
+
+# Cosine similarity on L2-normalized embeddings reduces to a dot product, so
+# scores are computed with plain NumPy instead of building DataFrames.
+
+
+def normalize(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize a vector or the rows of a matrix as float32; zero vectors stay zero."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.where(norms == 0, 1.0, norms)
+
+
+def cosine_similarity(embedding1: np.ndarray, embedding2: np.ndarray) -> float:
+    """Return the cosine similarity of two vectors."""
+    return float(np.dot(normalize(embedding1), normalize(embedding2)))
+
+
+def cosine_matrix(embeddings1: np.ndarray, embeddings2: np.ndarray, normalized: bool = False) -> np.ndarray:
+    """Return the cosine similarity of every row of embeddings1 against every row of embeddings2."""
+    if not normalized:
+        embeddings1, embeddings2 = normalize(embeddings1), normalize(embeddings2)
+    return embeddings1 @ embeddings2.T
+
+
+def paired_cosine(embeddings1: np.ndarray, embeddings2: np.ndarray, normalized: bool = False) -> np.ndarray:
+    """Return the cosine similarity of each row of embeddings1 with the same row of embeddings2."""
+    if not normalized:
+        embeddings1, embeddings2 = normalize(embeddings1), normalize(embeddings2)
+    return np.einsum('ij,ij->i', embeddings1, embeddings2)
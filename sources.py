@@ -0,0 +1,161 @@
+import os
+import lxml.html
+from lxml import etree
+from typing import Dict, List, Optional, Union
+from urllib.parse import quote_plus, urljoin
+from keywords import KeywordMatcher
+import metrics
+
+# Base URLs can be overridden so sweeps run against a local HTTP stand-in
+GOOGLE_SEARCH_URL = 'https://www.google.com/search'
+CALL4PAPERS_SEARCH_URL = 'https://www.call4papers.com/search'
+WIKICFP_SEARCH_URL = 'https://www.wikicfp.com/cfp/search'
+
+_PARSER = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True)
+
+
+def google_search_url(query: str) -> str:
+    """Build the Google search URL for a query."""
+    return f"{os.getenv('GOOGLE_SEARCH_URL', GOOGLE_SEARCH_URL)}?q={quote_plus(query)}"
+
+
+def conference_website_urls(conference: Dict) -> List[str]:
+    """Build the search URLs of common conference websites for a conference."""
+    encoded_name = quote_plus(conference['name'])
+    return [
+        f"{os.getenv('CALL4PAPERS_SEARCH_URL', CALL4PAPERS_SEARCH_URL)}?q={encoded_name}",
+        f"{os.getenv('WIKICFP_SEARCH_URL', WIKICFP_SEARCH_URL)}?q={encoded_name}"
+    ]
+
+
+def _class_xpath(tag: str, class_name: str) -> etree.XPath:
+    """Compile an XPath selecting descendant ``tag`` elements with a CSS class."""
+    return etree.XPath(f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]")
+
+
+class Extractor:
+    """Extracts search results from the HTML of one kind of source page.
+
+    Pages are parsed with lxml, and subclasses only walk the elements that
+    hold results instead of the whole tree.
+    """
+
+    name = 'links'
+
+    def extract(self, html: str, url: str, keywords: Optional[KeywordMatcher] = None) -> List[Dict]:
+        if not html or not html.strip():
+            return []
+        with metrics.PARSE_SECONDS.time(source=self.name):
+            root = lxml.html.document_fromstring(html.encode('utf-8'), parser=_PARSER)
+            return self._extract(root, url, keywords)
+
+    def _extract(self, root, url: str, keywords: Optional[KeywordMatcher]) -> List[Dict]:
+        raise NotImplementedError
+
+
+class GoogleExtractor(Extractor):
+    """Google result pages: one ``div.g`` container per result."""
+
+    name = 'google'
+    _results = _class_xpath('div', 'g')
+    _snippets = _class_xpath('div', 'VwiC3b')
+
+    def _extract(self, root, url, keywords):
+        results = []
+        for container in self._results(root):
+            title_elem = container.find('.//h3')
+            link_elem = container.find('.//a[@href]')
+            snippets = self._snippets(container)
+            snippet_elem = snippets[0] if snippets else None
+            if title_elem is not None and link_elem is not None:
+                results.append({
+                    'title': title_elem.text_content(),
+                    'link': urljoin(url, link_elem.get('href')),
+                    'snippet': snippet_elem.text_content() if snippet_elem is not None else '',
+                    'source': 'Google Search'
+                })
+        return results
+
+
+class LinkExtractor(Extractor):
+    """Any other page: every link whose text mentions one of the keywords."""
+
+    def _extract(self, root, url, keywords):
+        if not keywords:
+            return []
+        results = []
+        for link in root.iter('a'):
+            href = link.get('href')
+            if not href:
+                continue
+            text = link.text_content()
+            hits = keywords.hits(text)
+            if hits:
+                results.append({
+                    'title': text,
+                    'link': urljoin(url, href),
+                    'source': url,
+                    'keyword_hits': hits
+                })
+        return results
+
+
+class WikiCFPExtractor(LinkExtractor):
+    """WikiCFP search pages: event rows of the results table.
+
+    Each event spans two table rows; the first links the event page and
+    carries its full name, which is matched against the keywords along with
+    the link text. Pages without event links fall back to plain link
+    extraction.
+    """
+
+    name = 'wikicfp'
+    _event_links = etree.XPath(".//tr/td/a[contains(@href, 'showcfp')]")
+
+    def _extract(self, root, url, keywords):
+        event_links = self._event_links(root)
+        if not event_links:
+            return super()._extract(root, url, keywords)
+        if not keywords:
+            return []
+        results = []
+        for link in event_links:
+            hits = keywords.hits(link.getparent().getparent().text_content())
+            if hits:
+                results.append({
+                    'title': link.text_content(),
+                    'link': urljoin(url, link.get('href')),
+                    'source': url,
+                    'keyword_hits': hits
+                })
+        return results
+
+
+EXTRACTORS = {
+    'google': GoogleExtractor(),
+    'wikicfp': WikiCFPExtractor(),
+    'links': LinkExtractor()
+}
+
+
+def extractor_for(url: str) -> Extractor:
+    """Return the extractor for a conference website search page."""
+    if url.startswith(os.getenv('WIKICFP_SEARCH_URL', WIKICFP_SEARCH_URL)):
+        return EXTRACTORS['wikicfp']
+    return EXTRACTORS['links']
+
+
+def parse_google_results(html: str) -> List[Dict]:
+    """Extract search results from a Google result page."""
+    return EXTRACTORS['google'].extract(html, GOOGLE_SEARCH_URL)
+
+
+def parse_website_links(html: str, url: str, keywords: Union[KeywordMatcher, List[str]]) -> List[Dict]:
+    """Extract links mentioning any of the keywords from a conference website page.
+
+    Pass a ``KeywordMatcher`` built once per conference when parsing several
+    pages; each result lists the keywords it hit under ``keyword_hits``.
+    """
+    if not isinstance(keywords, KeywordMatcher):
+        keywords = KeywordMatcher(keywords or [])
+    return extractor_for(url).extract(html, url, keywords)
@@ -1,3 +1,3 @@
 #!/bin/bash
 pip install -r requirements.txt
-gunicorn --bind=0.0.0.0 --timeout 600 app:app 
\ No newline at end of file
+gunicorn --bind=0.0.0.0 --timeout 120 app:app 
\ No newline at end of file
@@ -0,0 +1,211 @@
+import json
+import os
+import tempfile
+import threading
+import uuid
+from typing import Dict, Iterable, Iterator, Optional
+
+
+def _atomic_write_lines(path: str, lines: Iterable[str]):
+    """Write lines to a temporary file and atomically replace ``path`` with it."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def new_conference_id() -> str:
+    return uuid.uuid4().hex
+
+
+class ConferenceStore:
+    """Storage backend for the standalone tracker's conferences.
+
+    Every conference record carries a string ``id``. ``load`` streams the
+    stored records, ``put_many`` inserts or updates records, and ``compact``
+    lets backends reclaim space.
+    """
+
+    def load(self) -> Iterator[Dict]:
+        raise NotImplementedError
+
+    def put_many(self, conferences: Iterable[Dict]):
+        raise NotImplementedError
+
+    def put(self, conference: Dict):
+        self.put_many([conference])
+
+    def compact(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonFileStore(ConferenceStore):
+    """Legacy backend keeping all conferences in one JSON array.
+
+    Every write rewrites the whole file, atomically.
+    """
+
+    def __init__(self, path: str = 'conferences.json'):
+        self.path = path
+        self._records: Optional[Dict[str, Dict]] = None
+
+    def load(self) -> Iterator[Dict]:
+        records = []
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        for record in records:
+            record.setdefault('id', new_conference_id())
+        self._records = {record['id']: record for record in records}
+        return iter(records)
+
+    def put_many(self, conferences: Iterable[Dict]):
+        if self._records is None:
+            list(self.load())
+        for conference in conferences:
+            self._records[conference['id']] = conference
+        _atomic_write_lines(self.path, [json.dumps(list(self._records.values()), indent=2)])
+
+
+class JsonlLogStore(ConferenceStore):
+    """Append-only JSON Lines log of conference records.
+
+    Each write appends the full record as one line and fsyncs it, so an
+    update costs O(1) and a crash loses at most the line being written; a
+    torn final line is ignored on load. When superseded lines outnumber live
+    records by ``compact_ratio``, the log is rewritten with only the latest
+    version of each record and atomically swapped in.
+
+    On first use, records are imported from a legacy JSON file if one exists.
+    """
+
+    def __init__(self, path: str = 'conferences.jsonl', legacy_path: Optional[str] = 'conferences.json',
+                 compact_ratio: float = 2.0, min_compact_lines: int = 1000, fsync: bool = True):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.compact_ratio = compact_ratio
+        self.min_compact_lines = min_compact_lines
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._line_count = None
+        self._live_ids = None
+
+    def _migrate_legacy(self):
+        if os.path.exists(self.path) or not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        records = list(JsonFileStore(self.legacy_path).load())
+        _atomic_write_lines(self.path, (json.dumps(record) + '\n' for record in records))
+        print(f"Migrated {len(records)} conferences from {self.legacy_path} to {self.path}")
+
+    def _repair_tail(self):
+        """Truncate a torn final line so later appends start on a fresh line."""
+        with open(self.path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            # Scan back to the last complete line
+            position = size - 1
+            while position > 0:
+                step = min(4096, position)
+                f.seek(position - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b'\n')
+                if newline != -1:
+                    f.truncate(position - step + newline + 1)
+                    return
+                position -= step
+            f.truncate(0)
+
+    def _read_latest(self) -> Dict[str, Dict]:
+        """Read the log and return the latest version of every live record."""
+        latest = {}
+        lines = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash; everything before it is intact
+                    continue
+                lines += 1
+                if record.get('_deleted'):
+                    latest.pop(record['id'], None)
+                else:
+                    latest[record['id']] = record
+        self._line_count = lines
+        self._live_ids = set(latest)
+        return latest
+
+    def load(self) -> Iterator[Dict]:
+        with self._lock:
+            self._migrate_legacy()
+            if not os.path.exists(self.path):
+                self._line_count = 0
+                self._live_ids = set()
+                return iter([])
+            self._repair_tail()
+            return iter(self._read_latest().values())
+
+    def put_many(self, conferences: Iterable[Dict]):
+        lines = [json.dumps(conference) + '\n' for conference in conferences]
+        if not lines:
+            return
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            if self._line_count is not None:
+                self._line_count += len(lines)
+                self._live_ids.update(json.loads(line)['id'] for line in lines)
+        self._maybe_compact()
+
+    def delete(self, conference_id: str):
+        self.put_many([{'id': conference_id, '_deleted': True}])
+        if self._live_ids is not None:
+            self._live_ids.discard(conference_id)
+
+    def _maybe_compact(self):
+        if self._line_count is None or self._line_count < self.min_compact_lines:
+            return
+        if self._line_count > self.compact_ratio * max(1, len(self._live_ids)):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the log with only the latest version of each record."""
+        with self._lock:
+            if not os.path.exists(self.path):
+                return
+            latest = self._read_latest()
+            _atomic_write_lines(self.path, (json.dumps(record) + '\n' for record in latest.values()))
+            self._line_count = len(latest)
+
+
+def open_store(backend: str = None) -> ConferenceStore:
+    """Open the conference store selected by ``CONFERENCE_STORE`` (``jsonl`` or ``json``)."""
+    backend = backend or os.getenv('CONFERENCE_STORE', 'jsonl')
+    if backend == 'json':
+        return JsonFileStore(os.getenv('CONFERENCES_FILE', 'conferences.json'))
+    if backend == 'jsonl':
+        return JsonlLogStore(
+            os.getenv('CONFERENCES_LOG', 'conferences.jsonl'),
+            legacy_path=os.getenv('CONFERENCES_FILE', 'conferences.json')
+        )
+    raise ValueError(f"Unknown conference store: {backend}")
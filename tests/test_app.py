@@ -0,0 +1,48 @@
+import importlib
+import os
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp('app')
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(workdir)
+        patch.setenv('DATABASE_URL', f"sqlite:///{workdir}/conferences.db")
+        patch.setenv('SCHEDULER_ENABLED', 'false')
+        yield importlib.import_module('app')
+
+
+def test_only_one_worker_claims_a_tick(app_module):
+    with app_module.app.app_context():
+        claims = [app_module._claim_lease('test-tick', 60) for _ in range(3)]
+        assert claims == [True, False, False]
+
+        app_module.SchedulerLease.query.filter_by(name='test-tick').update(
+            {app_module.SchedulerLease.expires_at: datetime.utcnow()}
+        )
+        app_module.db.session.commit()
+        assert app_module._claim_lease('test-tick', 60)
+
+
+def test_polled_stream_reports_conference_statuses(app_module):
+    with app_module.app.app_context():
+        started_at = datetime.utcnow()
+        checked = app_module.Conference(name='ICML', year=2025, keywords_csv='ml', status='Checked',
+                                         last_checked=datetime.utcnow())
+        untouched = app_module.Conference(name='NeurIPS', year=2025, keywords_csv='ml', status='Checked',
+                                          last_checked=datetime(2020, 1, 1))
+        job = app_module.CheckJob(id='polled-job', status='finished', total=1, completed=1, started_at=started_at)
+        app_module.db.session.add_all([checked, untouched, job])
+        app_module.db.session.commit()
+        checked_id = checked.id
+
+        events = list(app_module._poll_job_events('polled-job', heartbeat=15))
+
+        assert [(event['event'], event.get('conference_id')) for event in events] == [
+            ('status', checked_id),
+            ('job', None)
+        ]
+        assert events[0]['status'] == 'Checked'
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+import confseeker
+
+
+class FakeScorer:
+    def cache_stats(self):
+        return {'hits': 0, 'misses': 0}
+
+
+def test_first_tick_checks_due_conferences(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('CONFERENCE_STORE', 'jsonl')
+    monkeypatch.setenv('HTTP_CACHE_DIR', '')
+    monkeypatch.setenv('SCHEDULER_SLICE_SIZE', '10')
+    with open('conferences.jsonl', 'w', encoding='utf-8') as f:
+        for index in range(3):
+            f.write(json.dumps({'id': f'c{index}', 'name': f'Conf {index}', 'year': 2025,
+                                'keywords': ['ai'], 'link': None, 'last_checked': None}) + '\n')
+
+    tracker = confseeker.ConferenceTracker()
+    checked = []
+    monkeypatch.setattr(tracker, 'check_conferences', checked.extend)
+    tracker.check_due_conferences()
+
+    assert sorted(conference['id'] for conference in checked) == ['c0', 'c1', 'c2']
+
+
+def test_checked_chunks_survive_a_failed_sweep(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('CONFERENCE_STORE', 'jsonl')
+    monkeypatch.setenv('HTTP_CACHE_DIR', '')
+    monkeypatch.setenv('CHECK_CHUNK_SIZE', '1')
+    tracker = confseeker.ConferenceTracker()
+    tracker.add_conferences([{'name': f'Conf {index}', 'year': 2025, 'keywords': ['ai']} for index in range(3)])
+
+    def check_chunk(conferences, threshold, prefilter_stats):
+        if conferences[0]['name'] == 'Conf 1':
+            raise RuntimeError('crashed')
+        conferences[0]['last_checked'] = '2025-06-01T00:00:00'
+        return []
+
+    monkeypatch.setattr(confseeker.resources, 'get_scorer', FakeScorer)
+    monkeypatch.setattr(tracker, '_check_chunk', check_chunk)
+    with pytest.raises(RuntimeError):
+        tracker.check_conferences()
+
+    stored = {conference['name']: conference for conference in confseeker.open_store().load()}
+    assert stored['Conf 0']['last_checked'] == '2025-06-01T00:00:00'
+    assert stored['Conf 2']['last_checked'] is None
@@ -0,0 +1,16 @@
+from dedup import SeenMatchIndex, match_digest
+
+
+def test_append_after_torn_tail_survives_reload(tmp_path):
+    path = str(tmp_path / 'seen.bin')
+    first = match_digest('ICML|2025', 'https://icml.cc/2026')
+    second = match_digest('ICML|2025', 'https://icml.cc/2026/call')
+    with open(path, 'wb') as f:
+        f.write(first + second[:3])
+
+    SeenMatchIndex(path).add_many([second])
+
+    index = SeenMatchIndex(path)
+    assert first in index
+    assert second in index
+    assert len(index) == 2
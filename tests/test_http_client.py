@@ -0,0 +1,44 @@
+import os
+import time
+
+import requests
+
+from http_client import HttpClient, ResponseCache
+
+
+def _response(headers):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update(headers)
+    return response
+
+
+def test_store_skips_responses_that_cannot_be_reused(tmp_path):
+    client = HttpClient(cache_dir=str(tmp_path))
+    for index, headers in enumerate([
+        {'Cache-Control': 'max-age=0'},
+        {'Cache-Control': 'no-cache, max-age=60'},
+        {'Cache-Control': 'private, max-age=60', 'ETag': '"a"'},
+        {'Cache-Control': 'no-store', 'ETag': '"a"'},
+        {},
+    ]):
+        client._store(f'http://example.org/{index}', _response(headers), 'body')
+    assert os.listdir(str(tmp_path)) == []
+
+    client._store('http://example.org/fresh', _response({'Cache-Control': 'max-age=60'}), 'body')
+    client._store('http://example.org/etag', _response({'ETag': '"b"'}), 'body')
+    assert len(os.listdir(str(tmp_path))) == 2
+
+
+def test_cache_evicts_oldest_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=10)
+    for index in range(10):
+        cache.put(f'http://example.org/{index}', {'body': str(index)})
+        written = time.time() - 100 + index
+        os.utime(cache._path(f'http://example.org/{index}'), (written, written))
+
+    cache.put('http://example.org/new', {'body': 'new'})
+
+    assert len(os.listdir(str(tmp_path))) == 9
+    assert cache.get('http://example.org/0') is None
+    assert cache.get('http://example.org/new') == {'body': 'new'}